@@ -4,26 +4,40 @@ Orquesta el proceso completo de Extract, Transform, Load
 """
 
 import os
+import sys
+import argparse
 import logging
-import sqlite3
-import glob
-import tempfile
-import subprocess
-import pandas as pd
-
-from src.extract.data_extractor import DataExtractor
-from src.transform.data_transformer import DataTransformer
-from src.load.data_loader import DataLoader
-from src.enrich.external_enrichment import ExternalEnrichment
-from src.config import ENRICHMENT_CONFIG
-from src.logging_config import setup_rich_logging, get_rich_logger
+from pathlib import Path
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from src.config import ENRICHMENT_CONFIG, LOAD_CONFIG, PIPELINE_CONFIG
+from src.sql_manifest import load_sql_manifest
+
+# Heavy dependencies (pandas/pyarrow via the ETL components, Rich, sqlite3) are
+# imported where they are used, so importing this module stays cheap
 
 class ETLPipeline:
     """
     Pipeline principal que orquesta todo el proceso ETL
     """
 
-    def __init__(self):
+    def __init__(self, emit_dump: Optional[bool] = None, restore_from_dump: Optional[bool] = None):
+        """
+        Args:
+            emit_dump: Generar el volcado SQL tras la carga (por defecto LOAD_CONFIG['emit_sql_dump'])
+            restore_from_dump: Restaurar el volcado en memoria para validarlo tras la carga
+                (por defecto PIPELINE_CONFIG['restore_from_dump'])
+        """
+        self.emit_dump = LOAD_CONFIG.get('emit_sql_dump', False) if emit_dump is None else emit_dump
+        self.restore_from_dump = PIPELINE_CONFIG.get('restore_from_dump', False) if restore_from_dump is None else restore_from_dump
+
+        from src.logging_config import setup_rich_logging, get_rich_logger
+        from src.extract.data_extractor import DataExtractor
+        from src.transform.data_transformer import DataTransformer
+        from src.load.data_loader import DataLoader
+
         # Setup Rich logging first (initialize once for entire application)
         self.console = setup_rich_logging(level=logging.INFO)
         self.logger = get_rich_logger(__name__)
@@ -51,46 +65,81 @@ class ETLPipeline:
 
         if accounts_result['success']:
             records_count = accounts_result['extraction_result']['metadata']['total_records']
-            self.logger.info(f"[green]✓ Extracción completada: {records_count} registros extraídos[/green]")
+            self.logger.info("[green]✓ Extracción completada: %s registros extraídos[/green]", records_count)
         else:
-            self.logger.error(f"[red]✗ Error en extracción: {accounts_result['error']}[/red]")
+            self.logger.error("[red]✗ Error en extracción: %s[/red]", accounts_result['error'])
             return {'status': 'error', 'error': accounts_result['error']}
 
+        # Enrichment lookups only depend on the raw transaction dates: start them in the
+        # background so the API round-trips overlap with the transform
+        from src.enrich.external_enrichment import ExternalEnrichment
+
+        enricher = ExternalEnrichment(
+            holiday_country_code=ENRICHMENT_CONFIG.get('holiday_country_code','US'),
+            fx_target_currency=ENRICHMENT_CONFIG.get('fx_target_currency','USD'),
+            cache_dir=ENRICHMENT_CONFIG.get('cache_dir'),
+            cache_ttl_days=ENRICHMENT_CONFIG.get('cache_ttl_days', 30)
+        )
+        enable_holidays = ENRICHMENT_CONFIG.get('enable_holidays', True)
+        enable_fx = ENRICHMENT_CONFIG.get('enable_fx', False)
+        raw_records = accounts_result['extraction_result'].get('data') or []
+
+        prefetch_executor = ThreadPoolExecutor(max_workers=1)
+        prefetch_future = prefetch_executor.submit(
+            enricher.prefetch,
+            [r.get('transactionDate') for r in raw_records if isinstance(r, dict)],
+            currencies=[r.get('currency') for r in raw_records if isinstance(r, dict)],
+            enable_holidays=enable_holidays,
+            enable_fx=enable_fx,
+            fx_target_currency=ENRICHMENT_CONFIG.get('fx_target_currency', 'USD')
+        )
+        prefetch_executor.shutdown(wait=False)
+
         # TRANSFORM
         self.logger.info("\n[bold yellow]🔄 2. TRANSFORMANDO DATOS...[/bold yellow]")
-        latest_file = self.transformer.find_latest_raw_file('accounts')
+        save_result = accounts_result['save_result'] or {}
+        raw_table = save_result.get('table')
+
+        if raw_table is not None:
+            # La tabla Arrow recién guardada sigue en memoria: se transforma sin releer el parquet
+            transform_result = self.transformer.transform_from_arrow(
+                raw_table,
+                raw_filepath=save_result.get('filepath'),
+                save_processed=True,
+                processed_format='parquet'
+            )
+        else:
+            latest_file = self.transformer.find_latest_raw_file('accounts')
 
-        if not latest_file:
-            self.logger.error("[red]✗ No se encontró archivo raw para procesar[/red]")
-            return {'status': 'error', 'error': 'No raw file found'}
+            if not latest_file:
+                self.logger.error("[red]✗ No se encontró archivo raw para procesar[/red]")
+                return {'status': 'error', 'error': 'No raw file found'}
 
-        transform_result = self.transformer.transform_from_raw_file(
-            latest_file,
-            save_processed=True,
-            processed_format='parquet'
-        )
+            transform_result = self.transformer.transform_from_raw_file(
+                latest_file,
+                save_processed=True,
+                processed_format='parquet'
+            )
 
         if transform_result['success']:
-            self.logger.info(f"[yellow]✓ Transformación completada: {transform_result['transformed_records_count']} registros procesados[/yellow]")
+            self.logger.info("[yellow]✓ Transformación completada: %s registros procesados[/yellow]", transform_result['transformed_records_count'])
         else:
-            self.logger.error(f"[red]✗ Error en transformación: {transform_result['error']}[/red]")
+            self.logger.error("[red]✗ Error en transformación: %s[/red]", transform_result['error'])
             return {'status': 'error', 'error': transform_result['error']}
 
         # ENRICH
         self.logger.info("\n[bold cyan]🌟 2.1 ENRIQUECIENDO CON DATOS EXTERNOS...[/bold cyan]")
-        processed_data = transform_result['transformed_data']
+        processed_df = transform_result['transformed_data']
 
+        # Wait for the background prefetch; enrich() then reads the warmed cache. A failed
+        # prefetch only leaves the cache cold: enrich() still fetches and handles each lookup
         try:
-            enricher = ExternalEnrichment(
-                holiday_country_code=ENRICHMENT_CONFIG.get('holiday_country_code','US'),
-                fx_target_currency=ENRICHMENT_CONFIG.get('fx_target_currency','USD')
-            )
-            processed_df = pd.DataFrame(processed_data)
+            prefetch_future.result()
+        except Exception as e:
+            self.logger.warning("[yellow]⚠️ Error en la precarga de datos externos (continuando): %s[/yellow]", e)
 
+        try:
             # Apply enrichments based on config
-            enable_holidays = ENRICHMENT_CONFIG.get('enable_holidays', True)
-            enable_fx = ENRICHMENT_CONFIG.get('enable_fx', False)
-
             if enable_holidays:
                 self.logger.info("[cyan]📅 Enriqueciendo con festivos públicos...[/cyan]")
             if enable_fx:
@@ -102,11 +151,10 @@ class ETLPipeline:
                 enable_fx=enable_fx,
                 fx_target_currency=ENRICHMENT_CONFIG.get('fx_target_currency', 'USD')
             )
-            processed_data = processed_df.to_dict('records')
             self.logger.info("[cyan]✓ Enriquecimiento completado[/cyan]")
 
         except Exception as e:
-            self.logger.warning(f"[yellow]⚠️ Error en enriquecimiento (continuando): {str(e)}[/yellow]")
+            self.logger.warning("[yellow]⚠️ Error en enriquecimiento (continuando): %s[/yellow]", e)
             # Continue with original data if enrichment fails
 
         # LOAD
@@ -114,27 +162,34 @@ class ETLPipeline:
         db_path = 'data/processed/etl_results.sqlite'
         queries_dir = 'querys'
         os.makedirs(queries_dir, exist_ok=True)
-        sql_dump_path = os.path.join(queries_dir, 'etl_results_dump.sql')
+        compress_dump = LOAD_CONFIG.get('compress_sql_dump', False)
+        sql_dump_path = None
+        if self.emit_dump:
+            sql_dump_path = LOAD_CONFIG['sql_dump_path'] + ('.gz' if compress_dump else '')
         table_name = 'accounts'
 
         load_result = self.loader.save_to_database(
-            processed_data,
+            processed_df,
             db_path=db_path,
             sql_dump_path=sql_dump_path,
-            table_name=table_name
+            table_name=table_name,
+            compress_dump=compress_dump
         )
 
         if load_result['success']:
-            self.logger.info(f"[magenta]✓ Carga completada:[/magenta]")
-            self.logger.info(f"   [dim]• Base de datos: {db_path}[/dim]")
-            self.logger.info(f"   [dim]• Volcado SQL: {sql_dump_path}[/dim]")
+            self.logger.info("[magenta]✓ Carga completada:[/magenta]")
+            self.logger.info("   [dim]• Base de datos: %s[/dim]", db_path)
+            if sql_dump_path:
+                self.logger.info("   [dim]• Volcado SQL: %s[/dim]", sql_dump_path)
+                if self.restore_from_dump:
+                    self.validate_sql_dump(sql_dump_path)
         else:
-            self.logger.error(f"[red]✗ Error al guardar en base de datos: {load_result['error']}[/red]")
+            self.logger.error("[red]✗ Error al guardar en base de datos: %s[/red]", load_result['error'])
             return {'status': 'error', 'error': load_result['error']}
 
         # EXECUTE QUERIES
         self.logger.info("\n[bold blue]📊 4. EJECUTANDO QUERIES AUTOMÁTICAS...[/bold blue]")
-        self._execute_sql_queries(queries_dir, sql_dump_path)
+        self._execute_sql_queries(queries_dir, db_path)
 
         # SUCCESS SUMMARY
         self.logger.info("\n[bold green]" + "="*60 + "[/bold green]")
@@ -147,7 +202,7 @@ class ETLPipeline:
             ["Registros extraídos", f"{accounts_result['extraction_result']['metadata']['total_records']:,}"],
             ["Registros transformados", f"{transform_result['transformed_records_count']:,}"],
             ["Base de datos", db_path],
-            ["Volcado SQL", sql_dump_path],
+            ["Volcado SQL", sql_dump_path or "[dim]desactivado[/dim]"],
             ["Estado", "[green]SUCCESS[/green]"]
         ]
 
@@ -170,89 +225,166 @@ class ETLPipeline:
             'error': None
         }
 
-    def _execute_sql_queries(self, queries_dir: str, sql_dump_path: str):
+    def _execute_sql_queries(self, queries_dir: str, db_path: str):
         """
         Execute all SQL queries in the queries directory
 
         Args:
             queries_dir: Directory containing SQL files
-            sql_dump_path: Path to SQL dump file
+            db_path: Path to the SQLite database populated by the load step
         """
-        sql_files = sorted([f for f in glob.glob(f'{queries_dir}/*.sql')
-                           if not f.endswith('etl_results_dump.sql')])
+        sql_files = load_sql_manifest(queries_dir)
 
         if not sql_files:
             self.logger.info("[yellow]ℹ️ No se encontraron archivos .sql en la carpeta 'querys'[/yellow]")
             return
 
-        if not os.path.exists(sql_dump_path):
-            self.logger.error(f"[red]✗ No se encontró el volcado SQL: {sql_dump_path}[/red]")
+        if not os.path.exists(db_path):
+            self.logger.error("[red]✗ No se encontró la base de datos: %s[/red]", db_path)
             return
 
-        self.logger.info(f"[blue]📁 Encontrados {len(sql_files)} archivos SQL para ejecutar[/blue]")
+        self.logger.info("[blue]📁 Encontrados %s archivos SQL para ejecutar[/blue]", len(sql_files))
 
-        try:
-            # Create temporary database from SQL dump
-            with tempfile.NamedTemporaryFile(suffix='.sqlite', delete=False) as tmp_db:
-                tmp_db_path = tmp_db.name
+        # Query the freshly loaded database directly, read-only
+        db_uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
 
-            # Restore dump to temporary database
-            restore_cmd = f"sqlite3 {tmp_db_path} < {sql_dump_path}"
-            result = subprocess.run(restore_cmd, shell=True, capture_output=True, text=True)
+        from rich.console import Console
+        from rich.live import Live
+        from rich.table import Table
+        from rich.text import Text
+
+        # On a terminal, results are collected into one table rendered by a Live region;
+        # otherwise (CI, redirected output) each query is printed once as plain text, through a
+        # console that is not forced into terminal mode (the logging one is), so no ANSI escapes
+        interactive = sys.stdout.isatty()
+        plain_console = None if interactive else Console(force_terminal=False, no_color=True,
+                                                         highlight=False, soft_wrap=True)
+        results_table = Table(show_header=True, header_style="bold blue")
+        results_table.add_column("Query", style="cyan", overflow="fold")
+        results_table.add_column("Columnas")
+        results_table.add_column("Filas", justify="right", style="green")
+        results_table.add_column("Vista previa", style="dim")
 
-            if result.returncode != 0:
-                self.logger.error(f"[red]✗ Error restaurando la base desde {sql_dump_path}[/red]")
-                self.logger.error(f"[red]{result.stderr}[/red]")
-                return
+        try:
+            # Queries are independent reads: run them concurrently, one connection per worker
+            executed_count = 0
 
-            self.logger.info("[green]✓ Base temporal restaurada desde volcado SQL[/green]")
+            with ThreadPoolExecutor(max_workers=min(8, len(sql_files))) as executor, \
+                    (Live(results_table, console=self.console, refresh_per_second=4) if interactive else nullcontext()):
+                futures = [executor.submit(self._run_sql_file, sql_file, db_uri) for sql_file in sql_files]
 
-            # Execute each SQL file
-            conn = sqlite3.connect(tmp_db_path)
-            executed_count = 0
+                # Results are reported in manifest order (not completion order), so the
+                # output is the same on every run
+                for sql_file, future in zip(sql_files, futures):
+                    query_name = os.path.basename(sql_file)
 
-            for sql_file in sql_files:
-                query_name = os.path.basename(sql_file)
-                self.logger.info(f"\n[cyan]📝 Ejecutando: {query_name}[/cyan]")
+                    try:
+                        columns, preview, total_rows = future.result()
+                    except Exception as e:
+                        if interactive:
+                            results_table.add_row(query_name, "", "", Text(f"✗ Error: {e}", style="red"))
+                        else:
+                            plain_console.print(f"✗ Error ejecutando {query_name}: {e}", markup=False)
+                        continue
 
-                try:
-                    with open(sql_file, 'r', encoding='utf-8') as f:
-                        query = f.read()
+                    # Show first few rows
+                    preview_lines = [f"Fila {i+1}: {row}" for i, row in enumerate(preview)]
+                    if total_rows > len(preview):
+                        preview_lines.append(f"... y {total_rows-len(preview)} filas más")
+
+                    if interactive:
+                        results_table.add_row(query_name, Text(", ".join(columns)), f"{total_rows:,}",
+                                              Text("\n".join(preview_lines)))
+                    else:
+                        plain_console.print(f"Ejecutado: {query_name} | Columnas: {columns} | Total filas: {total_rows}\n   "
+                                            + "\n   ".join(preview_lines), markup=False)
+                    executed_count += 1
 
-                    result = conn.execute(query)
-                    rows = result.fetchall()
-                    columns = [desc[0] for desc in result.description] if result.description else []
+            self.logger.info("\n[green]✓ Queries ejecutadas exitosamente: %s/%s[/green]", executed_count, len(sql_files))
 
-                    self.logger.info(f"[green]   ✓ Columnas: {columns}[/green]")
+        except Exception as e:
+            self.logger.error("[red]✗ Error general ejecutando queries: %s[/red]", e)
 
-                    # Show first few rows
-                    for i, row in enumerate(rows[:3]):
-                        self.logger.info(f"[dim]   Fila {i+1}: {row}[/dim]")
+    @staticmethod
+    def _run_sql_file(sql_file: str, db_uri: str, preview_rows: int = 3):
+        """
+        Execute a single SQL file on its own read-only connection
 
-                    if len(rows) > 3:
-                        self.logger.info(f"[dim]   ... y {len(rows)-3} filas más[/dim]")
+        Only the preview rows are kept in memory; the rest of the result
+        set is streamed from the cursor just to count it.
 
-                    self.logger.info(f"[green]   📊 Total filas: {len(rows)}[/green]")
-                    executed_count += 1
+        Args:
+            sql_file: Path to the SQL file
+            db_uri: SQLite URI of the database to query
+            preview_rows: Number of rows to keep for display
+
+        Returns:
+            Tuple (columns, preview, total_rows)
+        """
+        import sqlite3
 
-                except Exception as e:
-                    self.logger.error(f"[red]   ✗ Error ejecutando {query_name}: {str(e)}[/red]")
+        with open(sql_file, 'r', encoding='utf-8') as f:
+            query = f.read()
 
+        conn = sqlite3.connect(db_uri, uri=True, check_same_thread=False)
+        try:
+            # Read-side tuning: serve pages through mmap, large page cache, temp b-trees in RAM
+            conn.execute('PRAGMA mmap_size=268435456')
+            conn.execute('PRAGMA cache_size=-200000')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            result = conn.execute(query)
+            columns = [desc[0] for desc in result.description] if result.description else []
+            preview = result.fetchmany(preview_rows)
+            total_rows = len(preview) + sum(1 for _ in result)
+            return columns, preview, total_rows
+        finally:
             conn.close()
 
-            self.logger.info(f"\n[green]✓ Queries ejecutadas exitosamente: {executed_count}/{len(sql_files)}[/green]")
+    def validate_sql_dump(self, sql_dump_path: str) -> bool:
+        """
+        Restore the SQL dump into an in-memory database to check it is loadable
 
-        except Exception as e:
-            self.logger.error(f"[red]✗ Error general ejecutando queries: {str(e)}[/red]")
+        Args:
+            sql_dump_path: Path to SQL dump file (plain or .gz)
 
+        Returns:
+            True if the dump was restored successfully
+        """
+        import gzip
+        import sqlite3
+
+        if not os.path.exists(sql_dump_path):
+            self.logger.error("[red]✗ No se encontró el volcado SQL: %s[/red]", sql_dump_path)
+            return False
+
+        conn = sqlite3.connect(':memory:')
+        try:
+            conn.executescript("PRAGMA temp_store=MEMORY;")
+            # iterdump() already wraps the dump in BEGIN TRANSACTION ... COMMIT
+            opener = gzip.open if sql_dump_path.endswith('.gz') else open
+            with opener(sql_dump_path, 'rt', encoding='utf-8') as f:
+                conn.executescript(f.read())
+            tables = conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+            self.logger.info("[green]✓ Volcado válido: %s tabla(s) restauradas desde %s[/green]", len(tables), sql_dump_path)
+            return True
+        except sqlite3.Error as e:
+            self.logger.error("[red]✗ Error restaurando la base desde %s: %s[/red]", sql_dump_path, e)
+            return False
         finally:
-            # Clean up temporary database
-            if 'tmp_db_path' in locals() and os.path.exists(tmp_db_path):
-                os.remove(tmp_db_path)
-                self.logger.info("[dim]🗑️ Base temporal eliminada[/dim]")
+            conn.close()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline ETL Fake Bank")
+    parser.add_argument('--validate-dump', metavar='SQL_DUMP',
+                        help="Solo restaura el volcado SQL indicado en memoria para validarlo")
+    args = parser.parse_args()
+
+    if args.validate_dump:
+        pipeline = ETLPipeline()
+        ok = pipeline.validate_sql_dump(args.validate_dump)
+        raise SystemExit(0 if ok else 1)
+
     # Ejecutar pipeline
     pipeline = ETLPipeline()
     result = pipeline.run_pipeline()
@@ -3,67 +3,194 @@ Ejecutor de consultas SQL escalable.
 
 Coloca tus archivos .sql en esta carpeta y ejecuta este script. Él hará:
 - Detectar si existe un volcado SQL (etl_results_dump.sql) en querys/ o una base SQLite en data/processed/.
-- Si hay volcado, lo restaurará a una base temporal y ejecutará las queries allí.
-- Guardará los resultados de cada query en archivos CSV dentro de querys/results/ para compartir.
+- Si hay un volcado al día (no más antiguo que la base), lo restaurará a una base temporal y ejecutará las queries allí.
+- Guardará los resultados de cada query en archivos Parquet (zstd) dentro de querys/results/ para compartir
+  (o en CSV con --emit-csv).
 """
+import argparse
 import sqlite3
-import glob
 import os
+import sys
 import tempfile
-import subprocess
+from contextlib import closing
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
+
+SQL_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SQL_DIR, '..'))
+from src.sql_manifest import load_sql_manifest
 
-SQL_DIR = os.path.dirname(__file__)
 DB_SQLITE = os.path.join(SQL_DIR, '..', 'data', 'processed', 'etl_results.sqlite')
 DUMP_SQL = os.path.join(SQL_DIR, 'etl_results_dump.sql')
 RESULTS_DIR = os.path.join(SQL_DIR, 'results')
-os.makedirs(RESULTS_DIR, exist_ok=True)
-
-# Buscar todos los archivos .sql de consultas (excluyendo el dump)
-sql_files = [f for f in sorted(glob.glob(os.path.join(SQL_DIR, '*.sql'))) if not f.endswith('etl_results_dump.sql')]
-
-if not sql_files:
-    print("No se encontraron archivos .sql de consulta en la carpeta querys.")
-    exit(0)
+CHUNK_SIZE = 50_000
 
-def get_connection():
-    """Obtener una conexión SQLite desde DB existente o restaurando el dump a una temporal."""
-    if os.path.exists(DUMP_SQL):
+def get_db_path():
+    """Obtener la ruta de una base SQLite desde DB existente o restaurando el dump a una temporal."""
+    # Un volcado más antiguo que la base (p. ej. con emit_sql_dump desactivado) estaría desactualizado
+    dump_is_current = os.path.exists(DUMP_SQL) and (
+        not os.path.exists(DB_SQLITE) or os.path.getmtime(DUMP_SQL) >= os.path.getmtime(DB_SQLITE))
+    if dump_is_current:
         # Restaurar a DB temporal
         tmp = tempfile.NamedTemporaryFile(suffix='.sqlite', delete=False)
         tmp_db_path = tmp.name
         tmp.close()
-        cmd = f"sqlite3 {tmp_db_path} < {DUMP_SQL}"
-        res = subprocess.run(cmd, shell=True)
-        if res.returncode != 0:
-            print(f"Error restaurando volcado: {DUMP_SQL}")
+        # Restaurar en el mismo proceso (sin shell ni binario sqlite3); el dump ya trae BEGIN/COMMIT
+        conn = sqlite3.connect(tmp_db_path)
+        try:
+            conn.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF;")
+            with open(DUMP_SQL, 'r', encoding='utf-8') as f:
+                conn.executescript(f.read())
+        except sqlite3.Error as e:
+            print(f"Error restaurando volcado: {DUMP_SQL} ({e})")
+            conn.close()
             os.unlink(tmp_db_path)
             raise SystemExit(1)
-        conn = sqlite3.connect(tmp_db_path)
-        return conn, tmp_db_path
+        conn.close()
+        return tmp_db_path, tmp_db_path
     elif os.path.exists(DB_SQLITE):
-        return sqlite3.connect(DB_SQLITE), None
+        return DB_SQLITE, None
     else:
         print("No se encontró ni el volcado .sql ni la base SQLite.")
         raise SystemExit(1)
 
-conn, tmp_path = get_connection()
+def _open_parquet_writer(out_path, tables):
+    """Abrir el ParquetWriter con un esquema común a los bloques ya leídos y escribirlos."""
+    schema = tables[0].schema
+    if len(tables) > 1:
+        # Columnas que eran todo NULL (tipo null) toman el tipo de los bloques siguientes;
+        # la promoción permisiva también admite enteros que pasan a ser flotantes
+        schema = pa.unify_schemas([table.schema for table in tables], promote_options='permissive').remove_metadata()
+    writer = pq.ParquetWriter(out_path, schema, compression='zstd')
+    for table in tables:
+        writer.write_table(table.cast(schema) if len(tables) > 1 else table)
+    return writer
+
+def _write_parquet_chunk(writer, path, table):
+    """Escribir un bloque con el esquema del writer; si no cabe, ensanchar el esquema reescribiendo lo ya escrito.
+
+    Devuelve el writer y la ruta en la que sigue escribiendo (cambia al reescribir).
+    """
+    if not table.schema.equals(writer.schema, check_metadata=False):
+        try:
+            table = table.cast(writer.schema)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+            # El bloque no cabe en los tipos de los anteriores (p. ej. enteros en las primeras filas y
+            # decimales después): se ensancha el esquema y los row groups ya escritos se copian,
+            # uno a uno, a un archivo nuevo con los tipos ensanchados
+            schema = pa.unify_schemas([writer.schema, table.schema], promote_options='permissive').remove_metadata()
+            writer.close()
+            fd, widened_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+            os.close(fd)
+            widened = pq.ParquetWriter(widened_path, schema, compression='zstd')
+            try:
+                written = pq.ParquetFile(path)
+                try:
+                    for i in range(written.num_row_groups):
+                        widened.write_table(written.read_row_group(i).cast(schema))
+                finally:
+                    written.close()
+                table = table.cast(schema)
+            except BaseException:
+                widened.close()
+                os.unlink(widened_path)
+                raise
+            os.unlink(path)
+            writer, path = widened, widened_path
+    writer.write_table(table)
+    return writer, path
 
-for sql_file in sql_files:
+def run_query(sql_file, db_path, emit_csv=False):
+    """Ejecutar un archivo .sql con su propia conexión y volcar el resultado a Parquet (o CSV) por bloques."""
     name = os.path.splitext(os.path.basename(sql_file))[0]
-    print(f"\n--- Ejecutando: {os.path.basename(sql_file)} ---")
     with open(sql_file, 'r', encoding='utf-8') as f:
         query = f.read()
-        try:
-            df = pd.read_sql_query(query, conn)
-            print(df.head(20))
-            out_csv = os.path.join(RESULTS_DIR, f"{name}.csv")
-            df.to_csv(out_csv, index=False)
-            print(f"Resultados guardados en: {out_csv}")
-        except Exception as e:
-            print(f"Error ejecutando {sql_file}: {e}")
-
-conn.close()
-if tmp_path and os.path.exists(tmp_path):
-    os.unlink(tmp_path)
-print("\nTodas las queries han sido ejecutadas.")
+    out_path = os.path.join(RESULTS_DIR, f"{name}.{'csv' if emit_csv else 'parquet'}")
+    # Se escribe en un archivo temporal y solo se publica al terminar: si la query falla
+    # a mitad, no queda un resultado truncado en results/
+    tmp_out_path = f"{out_path}.tmp"
+    writer = None
+    try:
+        with closing(sqlite3.connect(db_path, check_same_thread=False)) as conn:
+            # Ajustes de lectura: páginas vía mmap, caché grande y tablas temporales en memoria
+            conn.execute('PRAGMA mmap_size=268435456')
+            conn.execute('PRAGMA cache_size=-200000')
+            conn.execute('PRAGMA temp_store=MEMORY')
+
+            # Solo se mantiene en memoria un bloque de CHUNK_SIZE filas a la vez (salvo mientras
+            # alguna columna siga siendo todo NULL, ver pending)
+            preview = None
+            pending = []
+            for chunk in pd.read_sql_query(query, conn, chunksize=CHUNK_SIZE):
+                first = preview is None
+                if first:
+                    preview = chunk.head(20)
+                if emit_csv:
+                    chunk.to_csv(tmp_out_path, mode='w' if first else 'a', header=first, index=False)
+                elif writer is not None:
+                    # Cada bloque se escribe como un row group, con el esquema del writer
+                    writer, tmp_out_path = _write_parquet_chunk(writer, tmp_out_path,
+                                                                pa.Table.from_pandas(chunk, preserve_index=False))
+                else:
+                    # Una columna todo NULL se infiere como tipo null y fijaría ese tipo para los
+                    # bloques siguientes: se retienen los bloques hasta conocer el tipo de todas
+                    pending.append(pa.Table.from_pandas(chunk, preserve_index=False))
+                    if not any(pa.types.is_null(field.type) for field in pending[-1].schema):
+                        writer = _open_parquet_writer(tmp_out_path, pending)
+                        pending = []
+            if pending:
+                # Columnas NULL en todo el resultado: se escriben con tipo null
+                writer = _open_parquet_writer(tmp_out_path, pending)
+        if writer is not None:
+            writer.close()
+            writer = None
+        if preview is None:
+            # Resultado sin filas: no hay bloques que escribir
+            return preview, None
+        os.replace(tmp_out_path, out_path)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp_out_path):
+            os.unlink(tmp_out_path)
+    return preview, out_path
+
+def main():
+    """Ejecutar todas las queries .sql de querys/ y guardar sus resultados."""
+    parser = argparse.ArgumentParser(description="Ejecuta las queries .sql de querys/ y guarda sus resultados")
+    parser.add_argument('--emit-csv', action='store_true',
+                        help="Guardar los resultados en CSV en lugar de Parquet")
+    args = parser.parse_args()
+
+    # Buscar todos los archivos .sql de consultas (excluyendo el dump)
+    sql_files = load_sql_manifest(SQL_DIR)
+
+    if not sql_files:
+        print("No se encontraron archivos .sql de consulta en la carpeta querys.")
+        exit(0)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    db_path, tmp_path = get_db_path()
+
+    # Las queries son lecturas independientes: se ejecutan en paralelo, una conexión por hilo
+    with ThreadPoolExecutor(max_workers=min(8, len(sql_files))) as executor:
+        futures = [executor.submit(run_query, sql_file, db_path, args.emit_csv) for sql_file in sql_files]
+        # Los resultados se muestran en el orden del manifiesto (no en el de finalización),
+        # así la salida es la misma en cada ejecución
+        for sql_file, future in zip(sql_files, futures):
+            print(f"\n--- Ejecutado: {os.path.basename(sql_file)} ---")
+            try:
+                preview, out_path = future.result()
+                print(preview)
+                print(f"Resultados guardados en: {out_path}")
+            except Exception as e:
+                print(f"Error ejecutando {sql_file}: {e}")
+
+    if tmp_path and os.path.exists(tmp_path):
+        os.unlink(tmp_path)
+    print("\nTodas las queries han sido ejecutadas.")
+
+if __name__ == '__main__':
+    main()
@@ -34,5 +34,26 @@ ENRICHMENT_CONFIG = {
     # Enriquecimiento FX (Frankfurter API) para normalizar montos a una moneda
     # Solo se aplica si existe columna 'currency' en los datos
     'enable_fx': False,
-    'fx_target_currency': 'USD'
+    'fx_target_currency': 'USD',
+
+    # Caché local de respuestas de las APIs, por URL (festivos por país/año, FX por fecha).
+    # cache_ttl_days aplica a los festivos; el FX de fechas pasadas no caduca
+    'cache_dir': 'data/cache',
+    'cache_ttl_days': 30
+}
+
+# Configuración de la carga a SQLite
+LOAD_CONFIG = {
+    # El volcado .sql solo hace falta para compartir la base; desactivado agiliza la fase de carga
+    'emit_sql_dump': False,
+    'sql_dump_path': 'querys/etl_results_dump.sql',
+    # Comprimir el volcado con gzip (nivel 1); se guarda como <sql_dump_path>.gz
+    'compress_sql_dump': False
+}
+
+# Configuración del orquestador (main.py)
+PIPELINE_CONFIG = {
+    # Tras la carga, restaurar el volcado SQL en una base en memoria para comprobar
+    # que es válido (solo aplica si LOAD_CONFIG['emit_sql_dump'] está activo)
+    'restore_from_dump': False
 }
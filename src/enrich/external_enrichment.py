@@ -6,116 +6,261 @@ External data enrichment utilities
 
 from __future__ import annotations
 import logging
-from datetime import datetime
+import os
+import re
+import threading
+import time
+from datetime import date, datetime
 from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
+import orjson
 import pandas as pd
-import requests
+
+from ..http_session import get_session
+
+# Process-wide memo of API payloads by URL, shared by all ExternalEnrichment instances
+_RESPONSE_CACHE: Dict[str, Any] = {}
 
 
 class ExternalEnrichment:
-    def __init__(self, holiday_country_code: str = 'US', fx_target_currency: str = 'USD', timeout: int = 20):
+    # Upper bound on in-flight API requests (within the shared session's connection pool)
+    MAX_CONCURRENT_REQUESTS = 16
+
+    def __init__(self, holiday_country_code: str = 'US', fx_target_currency: str = 'USD', timeout: int = 20,
+                 cache_dir: Optional[str] = None, cache_ttl_days: int = 30):
         self.holiday_country_code = holiday_country_code
         self.fx_target_currency = fx_target_currency
         self.timeout = timeout
-        self.session = requests.Session()
+        self.cache_dir = cache_dir
+        self.cache_ttl_seconds = cache_ttl_days * 86400
+        # Pooled session with transport-level retries, shared with the extractor
+        self.session = get_session()
         self.logger = logging.getLogger(__name__)
 
+    # -------------------- Cache --------------------
+    @staticmethod
+    def _cache_filename(url: str) -> str:
+        """File name of the on-disk cache entry for `url`."""
+        return re.sub(r'[^A-Za-z0-9.-]+', '_', url.split('://', 1)[-1]).strip('_') + '.json'
+
+    def _get_json_cached(self, url: str, expire_after: Optional[float]) -> Any:
+        """GET a JSON payload keyed by URL, memoized in-process and, if cache_dir is set,
+        on disk for `expire_after` seconds (None: the entry never expires).
+        Returns None for an error status; nothing is cached then."""
+        if url in _RESPONSE_CACHE:
+            return _RESPONSE_CACHE[url]
+
+        cache_path = os.path.join(self.cache_dir, self._cache_filename(url)) if self.cache_dir else None
+        fresh = cache_path is not None and os.path.exists(cache_path) and (
+            expire_after is None or time.time() - os.path.getmtime(cache_path) < expire_after)
+        if fresh:
+            with open(cache_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            resp = self.session.get(url, timeout=self.timeout)
+            if not resp.ok:
+                self.logger.warning(f"HTTP {resp.status_code} for {url}")
+                return None
+            data = orjson.loads(resp.content)
+            if cache_path:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                # The raw response bytes are already valid JSON
+                with open(tmp_path, 'wb') as f:
+                    f.write(resp.content)
+                os.replace(tmp_path, cache_path)
+
+        _RESPONSE_CACHE[url] = data
+        return data
+
     # -------------------- Holidays --------------------
+    def _fetch_holiday_year(self, year: int) -> List[Dict[str, Any]]:
+        """Fetch the public holidays of a single year from Nager.Date API."""
+        url = f"https://date.nager.at/api/v3/PublicHolidays/{year}/{self.holiday_country_code}"
+        try:
+            data = self._get_json_cached(url, expire_after=self.cache_ttl_seconds)
+        except Exception as e:
+            self.logger.warning(f"Holiday fetch failed for {year}: {e}")
+            return []
+        if data is None:
+            return []
+        return [{
+            'date': item.get('date'),  # YYYY-MM-DD
+            'localName': item.get('localName'),
+            'name': item.get('name'),
+            'countryCode': item.get('countryCode'),
+            'types': ','.join(item.get('types', [])) if isinstance(item.get('types'), list) else item.get('types'),
+        } for item in data]
+
     def _fetch_holidays(self, years: List[int]) -> pd.DataFrame:
-        """Fetch public holidays for given years from Nager.Date API."""
+        """Fetch public holidays for given years from Nager.Date API, one concurrent request per year."""
+        unique_years = sorted(set(int(y) for y in years if pd.notnull(y)))
         rows: List[Dict[str, Any]] = []
-        for y in sorted(set([y for y in years if pd.notnull(y)])):
-            url = f"https://date.nager.at/api/v3/PublicHolidays/{int(y)}/{self.holiday_country_code}"
-            try:
-                resp = self.session.get(url, timeout=self.timeout)
-                resp.raise_for_status()
-                data = resp.json()
-                for item in data:
-                    rows.append({
-                        'date': item.get('date'),  # YYYY-MM-DD
-                        'localName': item.get('localName'),
-                        'name': item.get('name'),
-                        'countryCode': item.get('countryCode'),
-                        'types': ','.join(item.get('types', [])) if isinstance(item.get('types'), list) else item.get('types'),
-                    })
-            except Exception as e:
-                self.logger.warning(f"Holiday fetch failed for {y}: {e}")
+        if unique_years:
+            with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENT_REQUESTS, len(unique_years))) as executor:
+                for year_rows in executor.map(self._fetch_holiday_year, unique_years):
+                    rows.extend(year_rows)
         return pd.DataFrame(rows)
 
-    def enrich_with_holidays(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _holiday_years(df: pd.DataFrame) -> List[int]:
+        dt = pd.to_datetime(df['transaction_date'], format='%Y-%m-%d', errors='coerce', cache=True)
+        return dt.dt.year.dropna().astype(int).unique().tolist()
+
+    def enrich_with_holidays(self, df: pd.DataFrame, holidays: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Flag public holidays; `holidays` may be passed pre-fetched (see `enrich`)."""
         if 'transaction_date' not in df.columns:
             return df
-        df_out = df.copy()
-        dt = pd.to_datetime(df_out['transaction_date'], errors='coerce')
-        years = dt.dt.year.dropna().astype(int).unique().tolist()
-        h = self._fetch_holidays(years)
+        # New columns only: a shallow copy is enough to leave the caller's frame untouched
+        df_out = df.copy(deep=False)
+        h = holidays if holidays is not None else self._fetch_holidays(self._holiday_years(df_out))
         if h.empty:
             df_out['is_public_holiday'] = False
             return df_out
-        h['date'] = pd.to_datetime(h['date'], errors='coerce')
-        h = h.dropna(subset=['date'])
-        h['date_str'] = h['date'].dt.strftime('%Y-%m-%d')
-        df_out['is_public_holiday'] = df_out['transaction_date'].isin(h['date_str'])
+        # Compare calendar days as int64 day counts (NaT holidays dropped, so NaT rows never match)
+        holiday_dates = pd.to_datetime(h['date'], format='%Y-%m-%d', errors='coerce', cache=True).dropna()
+        tx_dates = pd.to_datetime(df_out['transaction_date'], format='%Y-%m-%d', errors='coerce', cache=True)
+        holiday_days = holiday_dates.to_numpy().astype('datetime64[D]').view('i8')
+        tx_days = tx_dates.to_numpy().astype('datetime64[D]').view('i8')
+        df_out['is_public_holiday'] = np.isin(tx_days, holiday_days)
         return df_out
 
     # -------------------- FX --------------------
+    def _fetch_fx_date(self, d: str) -> Optional[Dict[str, Any]]:
+        """Fetch the EUR-based FX rates of a single date from Frankfurter API."""
+        try:
+            url = f"https://api.frankfurter.app/{d}?from=EUR"
+            # Rates of past dates are final; today's are still published during the day
+            expire_after = None if d < date.today().isoformat() else 3600
+            payload = self._get_json_cached(url, expire_after=expire_after)
+        except Exception as e:
+            self.logger.warning(f"FX fetch failed for {d}: {e}")
+            return None
+        if payload is None:
+            return None
+        rates = dict(payload.get('rates', {}))
+        rates['EUR'] = 1.0
+        return {'date': d, **rates}
+
     def _fetch_fx_rates(self, dates: List[str], from_currencies: List[str]) -> pd.DataFrame:
-        """Fetch FX rates from Frankfurter API (base=EUR). We'll convert via EUR if needed."""
-        rows: List[Dict[str, Any]] = []
+        """Fetch FX rates from Frankfurter API (base=EUR), one concurrent request per date. We'll convert via EUR if needed."""
         unique_dates = sorted(set([d for d in dates if isinstance(d, str) and len(d) == 10]))
         unique_curs = sorted(set([c for c in from_currencies if isinstance(c, str) and c]))
         if not unique_dates or not unique_curs:
             return pd.DataFrame()
-        for d in unique_dates:
-            try:
-                url = f"https://api.frankfurter.app/{d}?from=EUR"
-                resp = self.session.get(url, timeout=self.timeout)
-                resp.raise_for_status()
-                payload = resp.json()
-                rates = payload.get('rates', {})
-                rates['EUR'] = 1.0
-                rows.append({'date': d, **rates})
-            except Exception as e:
-                self.logger.warning(f"FX fetch failed for {d}: {e}")
+        with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENT_REQUESTS, len(unique_dates))) as executor:
+            rows = [row for row in executor.map(self._fetch_fx_date, unique_dates) if row is not None]
         return pd.DataFrame(rows)
 
-    def enrich_with_fx(self, df: pd.DataFrame, target_currency: Optional[str] = None) -> pd.DataFrame:
+    @staticmethod
+    def _needs_fx(df: pd.DataFrame, target: str) -> np.ndarray:
+        """Boolean mask of the rows whose currency is not already `target`."""
+        return (df['currency'].astype(str).str.upper() != target).to_numpy(dtype=bool)
+
+    @classmethod
+    def _fx_request(cls, df: pd.DataFrame, target: str) -> tuple:
+        """Distinct dates and source currencies needed to convert `df` to `target`."""
+        # Rows already in the target currency need no rates
+        df = df.loc[cls._needs_fx(df, target)]
+        # Categorical factorization dedups in one vectorized pass (categories never include NaN),
+        # so the string handling below only touches the distinct values
+        dates = [str(d) for d in df['transaction_date'].astype('category').cat.categories]
+        from_curs = sorted({str(c).upper() for c in df['currency'].astype('category').cat.categories})
+        return dates, from_curs
+
+    def enrich_with_fx(self, df: pd.DataFrame, target_currency: Optional[str] = None,
+                       fx_rates: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Add amounts converted to the target currency; `fx_rates` may be passed pre-fetched (see `enrich`)."""
         if 'transaction_date' not in df.columns or 'currency' not in df.columns:
             return df
         target = (target_currency or self.fx_target_currency or 'USD').upper()
-        df_out = df.copy()
-        # Gather needed dates and currencies
-        dates = df_out['transaction_date'].dropna().astype(str).tolist()
-        from_curs = df_out['currency'].dropna().astype(str).str.upper().tolist()
-        fx = self._fetch_fx_rates(dates, from_curs)
-        if fx.empty:
-            return df_out
-        # Melt wide rates into tidy for easy lookup
-        fx_melt = fx.melt(id_vars=['date'], var_name='cur', value_name='rate_per_EUR')
-        # Join by date
-        df_out = df_out.merge(fx_melt, left_on=['transaction_date'], right_on=['date'], how='left')
-        # Compute conversion factor: amount_in_target = amount_in_source * (EUR->target)/(EUR->source)
-        # For that we need EUR->target on same date
-        eur_to_target = fx_melt[fx_melt['cur'] == target][['date', 'rate_per_EUR']].rename(columns={'rate_per_EUR': 'eur_to_target'})
-        df_out = df_out.merge(eur_to_target, left_on='transaction_date', right_on='date', how='left', suffixes=('', '_t'))
-        # Source currency EUR->source
-        src_cur_rate = fx_melt.rename(columns={'cur': 'src_cur', 'rate_per_EUR': 'eur_to_src'})
-        df_out = df_out.merge(src_cur_rate[['date', 'src_cur', 'eur_to_src']], left_on=['transaction_date','currency'], right_on=['date','src_cur'], how='left')
-        # Avoid division by zero
-        df_out['fx_factor'] = (df_out['eur_to_target'] / df_out['eur_to_src']).replace([pd.NA, float('inf')], pd.NA)
-        for col in ['net_transaction_amount', 'credit_amount', 'debit_amount']:
-            if col in df_out.columns:
-                df_out[f'{col}_{target}'] = (df_out[col] * df_out['fx_factor']).astype(float)
-        # Cleanup helper columns
-        drop_cols = [c for c in ['rate_per_EUR','eur_to_target','eur_to_src','src_cur','date','date_t'] if c in df_out.columns]
-        df_out = df_out.drop(columns=drop_cols)
+        # New columns only: a shallow copy is enough to leave the caller's frame untouched
+        df_out = df.copy(deep=False)
+        needs_fx = self._needs_fx(df_out, target)
+        if not needs_fx.any():
+            # Everything is already in the target currency: no rates to fetch or look up
+            fx_factor = np.ones(len(df_out))
+        else:
+            fx = fx_rates if fx_rates is not None else self._fetch_fx_rates(*self._fx_request(df_out, target))
+            if fx.empty:
+                return df_out
+            fx_factor = self._fx_factor(df_out, fx, target, needs_fx)
+        df_out['fx_factor'] = fx_factor
+        # Convert all amount columns in one broadcast multiply over a float64 block,
+        # without pandas alignment or per-column arithmetic
+        amount_cols = [c for c in ['net_transaction_amount', 'credit_amount', 'debit_amount'] if c in df_out.columns]
+        if amount_cols:
+            converted = df_out[amount_cols].to_numpy(dtype=np.float64, na_value=np.nan) * fx_factor[:, None]
+            for i, col in enumerate(amount_cols):
+                df_out[f'{col}_{target}'] = converted[:, i]
         return df_out
 
+    @staticmethod
+    def _fx_factor(df: pd.DataFrame, fx: pd.DataFrame, target: str, needs_fx: np.ndarray) -> np.ndarray:
+        """Per-row factor to `target` (1.0 for rows already in it, NaN where a rate is missing)."""
+        # Keep the rates wide (one row per date, one column per currency, units per EUR)
+        # and gather each row's rates by integer position instead of joining frames
+        # amount_in_target = amount_in_source * (EUR->target)/(EUR->source)
+        rates = fx.set_index('date')
+        # One row per date, like a validate='m:1' join: duplicates would make the lookup ambiguous
+        if not rates.index.is_unique:
+            raise ValueError("FX rates contain duplicate dates")
+        rates_matrix = rates.to_numpy(dtype=float)
+        row_pos = rates.index.get_indexer(df['transaction_date'])
+        col_pos = rates.columns.get_indexer(df['currency'].astype(str).str.upper())
+        # Only the rows that actually change currency are looked up
+        has_date = needs_fx & (row_pos >= 0)
+        has_rate = has_date & (col_pos >= 0)
+
+        eur_to_src = np.full(len(df), np.nan)
+        eur_to_src[has_rate] = rates_matrix[row_pos[has_rate], col_pos[has_rate]]
+        eur_to_target = np.full(len(df), np.nan)
+        if target in rates.columns:
+            eur_to_target[has_date] = rates_matrix[row_pos[has_date], rates.columns.get_loc(target)]
+        # Avoid division by zero
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fx_factor = eur_to_target / eur_to_src
+        fx_factor[np.isinf(fx_factor)] = np.nan
+        fx_factor[~needs_fx] = 1.0
+        return fx_factor
+
+    def prefetch(self, transaction_dates: List[Any], currencies: Optional[List[Any]] = None,
+                 enable_holidays: bool = True, enable_fx: bool = False,
+                 fx_target_currency: Optional[str] = None) -> None:
+        """Warm the response cache from raw transaction dates, e.g. in a background thread while the data is transformed."""
+        dates = pd.to_datetime(pd.Series(transaction_dates, dtype=object), errors='coerce')
+        if not dates.notna().any():
+            return
+        if enable_holidays:
+            self._fetch_holidays(dates.dt.year.dropna().astype(int).unique().tolist())
+        if enable_fx and currencies:
+            # Same request enrich() makes: rows already in the target currency need no rates
+            target = (fx_target_currency or self.fx_target_currency or 'USD').upper()
+            request = pd.DataFrame({'transaction_date': dates.dt.strftime('%Y-%m-%d'),
+                                    'currency': pd.Series(currencies, dtype=object)})
+            self._fetch_fx_rates(*self._fx_request(request, target))
+
     def enrich(self, df: pd.DataFrame, enable_holidays: bool = True, enable_fx: bool = False, fx_target_currency: str = 'USD') -> pd.DataFrame:
+        do_holidays = enable_holidays and 'transaction_date' in df.columns
+        do_fx = enable_fx and 'transaction_date' in df.columns and 'currency' in df.columns
+
+        fx_target = (fx_target_currency or self.fx_target_currency or 'USD').upper()
+
+        # Holiday and FX lookups are independent network round-trips: issue them concurrently
+        holidays = fx_rates = None
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            holidays_future = executor.submit(self._fetch_holidays, self._holiday_years(df)) if do_holidays else None
+            fx_future = executor.submit(self._fetch_fx_rates, *self._fx_request(df, fx_target)) if do_fx else None
+            if holidays_future is not None:
+                holidays = holidays_future.result()
+            if fx_future is not None:
+                fx_rates = fx_future.result()
+
         out = df
-        if enable_holidays:
-            out = self.enrich_with_holidays(out)
-        if enable_fx:
-            out = self.enrich_with_fx(out, target_currency=fx_target_currency)
+        if do_holidays:
+            out = self.enrich_with_holidays(out, holidays=holidays)
+        if do_fx:
+            out = self.enrich_with_fx(out, target_currency=fx_target_currency, fx_rates=fx_rates)
         return out
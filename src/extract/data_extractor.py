@@ -3,15 +3,12 @@ REST APIs Data Extractor
 """
 
 import requests
-import json
-import logging
-import os
-import sys
+import orjson
 from typing import Dict, Any, Optional
 from datetime import datetime
 
 from ..logging_config import get_rich_logger
-from ..load.data_loader import DataLoader
+from ..http_session import get_session
 
 
 class DataExtractor:
@@ -29,15 +26,17 @@ class DataExtractor:
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
-        self.session = requests.Session()
-        self.loader = DataLoader()
+        # Pooled session (keep-alive + retries) shared with the other API clients
+        self.session = get_session()
+        # Created on the first save, so extraction alone never imports the loader (pandas)
+        self.loader = None
 
-        # Configure default headers
-        self.session.headers.update({
+        # Default headers, sent per request so the shared session stays generic
+        self.headers = {
             'User-Agent': 'DataExtractor/1.0',
             'Accept': 'application/json',
             'Content-Type': 'application/json'
-        })
+        }
 
         # Configure logging
         self.logger = get_rich_logger(__name__)
@@ -63,11 +62,11 @@ class DataExtractor:
             self.logger.info(f"Extracting data from: {url}")
 
             # Make the request
-            response = self.session.get(url, params=params, timeout=self.timeout)
+            response = self.session.get(url, params=params, headers=self.headers, timeout=self.timeout)
             response.raise_for_status()
 
-            # Convert to JSON
-            data = response.json()
+            # Convert to JSON (orjson parses straight from the response bytes)
+            data = orjson.loads(response.content)
 
             # Success log
             records_count = len(data) if isinstance(data, list) else 1
@@ -101,7 +100,7 @@ class DataExtractor:
                 'error': error_message
             }
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             error_message = f"JSON decoding error: {str(e)}"
             self.logger.error(error_message)
 
@@ -187,6 +186,9 @@ class DataExtractor:
             filepath = f"data/raw/{filename}"
 
             # Save using DataLoader
+            if self.loader is None:
+                from ..load.data_loader import DataLoader
+                self.loader = DataLoader()
             self.logger.info(f"Saving {data_type} data to {filepath}")
             save_result = self.loader.save_data(extraction_result['data'], filepath, save_format)
 
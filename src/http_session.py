@@ -0,0 +1,35 @@
+"""
+Shared HTTP session
+A single pooled requests.Session reused by every API client of the pipeline
+"""
+
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import API_CONFIG
+
+# Keep-alive connections kept per host (>= the concurrent fetches of the enrichment step)
+POOL_SIZE = 32
+
+
+@lru_cache(maxsize=None)
+def get_session() -> requests.Session:
+    """
+    Build, once per process, the session shared by DataExtractor and ExternalEnrichment
+
+    Returns:
+        requests.Session with an enlarged connection pool and transport-level retries
+    """
+    session = requests.Session()
+
+    # Retries with backoff for transient API failures
+    retries = Retry(total=API_CONFIG.get('max_retries', 3), backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    return session
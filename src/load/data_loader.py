@@ -5,11 +5,16 @@ Implementation for saving data to different formats and destinations
 
 import json
 import csv
+import gzip
 import os
 import logging
+from operator import itemgetter
 from typing import Dict, Any, List, Union
 from datetime import datetime
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 from ..logging_config import get_rich_logger
 
@@ -19,6 +24,9 @@ class DataLoader:
     Class for loading/saving data to final destinations
     """
 
+    # String values stored as null in the raw parquet
+    NULL_LIKE_STRINGS = pa.array(['{}', '[]', 'nan', 'NaN'])
+
     def __init__(self):
         """
         Initialize the data loader
@@ -51,25 +59,33 @@ class DataLoader:
             if not data:
                 raise ValueError("No data to save")
 
-            # Get all possible fieldnames from the data
-            fieldnames = set()
-            for record in data:
-                if isinstance(record, dict):
-                    fieldnames.update(record.keys())
+            # Get all possible fieldnames from the data, in order of first appearance
+            fieldnames = list(dict.fromkeys(key for record in data if isinstance(record, dict) for key in record))
 
-            fieldnames = sorted(list(fieldnames))
+            # Project every record onto the header order as a tuple: one itemgetter
+            # call per complete record (a record with every field has len == n_fields),
+            # .get() with '' defaults only for the ones missing fields
+            n_fields = len(fieldnames)
+            get = itemgetter(*fieldnames)
+            if n_fields == 1:
+                project = lambda record: (get(record),)
+            else:
+                project = get
+            rows = (project(record) if len(record) == n_fields
+                    else tuple(record.get(field, '') for field in fieldnames)
+                    for record in data)
 
-            # Save to CSV file
-            with open(filepath, 'w', newline='', encoding=encoding) as file:
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(data)
+            # Save to CSV file (1 MiB buffer: csv.writer emits one small write per row)
+            with open(filepath, 'w', newline='', encoding=encoding, buffering=1 << 20) as file:
+                writer = csv.writer(file)
+                writer.writerow(fieldnames)
+                writer.writerows(rows)
 
             # Get file size
             file_size = os.path.getsize(filepath)
 
-            self.logger.info(f"Data saved successfully to CSV: {filepath}")
-            self.logger.info(f"File size: {file_size} bytes, Records: {len(data)}")
+            self.logger.info("Data saved successfully to CSV: %s", filepath)
+            self.logger.info("File size: %s bytes, Records: %s", file_size, len(data))
 
             return {
                 'success': True,
@@ -95,13 +111,68 @@ class DataLoader:
                 'error': error_message
             }
 
-    def save_to_parquet(self, data: Union[List[Dict], Dict], filepath: str) -> Dict[str, Any]:
+    @staticmethod
+    def _downcast_integers(array: pa.Array) -> pa.Array:
+        """
+        Store an int64 column as int32 when all its values fit (half the bytes to encode)
+
+        Args:
+            array: Arrow array of any type
+
+        Returns:
+            The array, cast to int32 if it is int64 within the int32 range
+        """
+        if array.type != pa.int64():
+            return array
+        bounds = pc.min_max(array)
+        low, high = bounds['min'].as_py(), bounds['max'].as_py()
+        # Not narrower than int32, so downstream integer arithmetic keeps its headroom
+        if low is not None and -2**31 <= low and high < 2**31:
+            return array.cast(pa.int32())
+        return array
+
+    @staticmethod
+    def _arrow_column(values: List[Any]) -> pa.Array:
+        """
+        Build a parquet-compatible Arrow array from the raw values of one column
+
+        Args:
+            values: Column values, one per record (None when missing)
+
+        Returns:
+            Arrow array typed by inference; mixed or nested columns fall back to
+            numeric when every value parses as a number, otherwise to strings
+        """
+        try:
+            array = pa.array(values, from_pandas=True)
+            if not (pa.types.is_nested(array.type) or pa.types.is_null(array.type)):
+                return DataLoader._downcast_integers(array)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+
+        # Mixed types (e.g. numbers and strings), nested or all-null values
+        try:
+            return DataLoader._downcast_integers(
+                pa.array(pd.to_numeric(pd.Series(values, dtype=object)), from_pandas=True))
+        except (ValueError, TypeError):
+            pass
+
+        # Keep as strings; empty dicts/lists would otherwise break the parquet struct types,
+        # so those (and NaN) become nulls in one hashed pass over the column
+        strings = pa.array([None if v is None else str(v) for v in values], type=pa.string())
+        missing = pc.is_in(strings, value_set=DataLoader.NULL_LIKE_STRINGS)
+        if pc.any(missing).as_py():
+            strings = pc.if_else(missing, pa.scalar(None, pa.string()), strings)
+        return strings
+
+    def save_to_parquet(self, data: Union[List[Dict], Dict], filepath: str, row_group_size: int = 65536) -> Dict[str, Any]:
         """
         Save data to parquet format with data type cleaning
 
         Args:
             data: Data to save (list of dicts or single dict)
             filepath: Path where to save the parquet file
+            row_group_size: Rows per parquet row group (default: 65536)
 
         Returns:
             Dict with operation result and metadata
@@ -118,66 +189,46 @@ class DataLoader:
             if not data:
                 raise ValueError("No data to save")
 
-            # Convert to DataFrame
-            df = pd.DataFrame(data)
-
-            # Clean data for parquet compatibility
-            df_cleaned = df.copy()
-
-            # Handle each column
-            for col in df_cleaned.columns:
-                # Skip if already numeric
-                if pd.api.types.is_numeric_dtype(df_cleaned[col]):
-                    continue
-
-                # Handle string columns that might contain numbers
-                if df_cleaned[col].dtype == 'object':
-                    # Try to convert to numeric with explicit exception handling
-                    try:
-                        df_cleaned[col] = pd.to_numeric(df_cleaned[col])
-                    except (ValueError, TypeError):
-                        # If conversion fails, keep as object and handle special cases
-                        pass
-
-                    # If still object type, convert to string and handle special cases
-                    if df_cleaned[col].dtype == 'object':
-                        # Convert to string first
-                        df_cleaned[col] = df_cleaned[col].astype(str)
-
-                        # Replace empty dicts/objects that cause struct type errors
-                        df_cleaned[col] = df_cleaned[col].replace(['{}', '[]', 'nan', 'NaN'], None)
-
-            # Add extraction metadata as a column
-            df_cleaned['extraction_timestamp'] = datetime.now().isoformat()
-
-            # Save to parquet with error handling
-            try:
-                df_cleaned.to_parquet(filepath, index=False, engine='pyarrow')
-            except Exception as parquet_error:
-                # If parquet fails, convert all remaining object columns to string
-                self.logger.warning(f"First parquet attempt failed: {str(parquet_error)}")
-                self.logger.info("Converting all object columns to string and retrying...")
-
-                for col in df_cleaned.select_dtypes(include=['object']).columns:
-                    df_cleaned[col] = df_cleaned[col].astype(str)
-
-                # Try saving again
-                df_cleaned.to_parquet(filepath, index=False, engine='pyarrow')
+            # Build the Arrow table column by column straight from the records,
+            # columns in order of first appearance as pd.DataFrame would list them
+            records = [record if isinstance(record, dict) else {} for record in data]
+            columns = list(dict.fromkeys(key for record in records for key in record))
+            table = pa.Table.from_arrays(
+                [self._arrow_column([record.get(col) for record in records]) for col in columns],
+                names=columns
+            )
+
+            # Add extraction metadata as a column, broadcast from a single scalar in
+            # Arrow (no per-row Python list); parquet dictionary-encodes it to one value
+            extraction_timestamp = pa.scalar(datetime.now().isoformat(), type=pa.string())
+            table = table.append_column('extraction_timestamp',
+                                        pc.fill_null(pa.nulls(table.num_rows, type=pa.string()), extraction_timestamp))
+
+            # Stream the table out one row group at a time, so the writer only
+            # buffers and encodes a bounded batch of rows at once; 1 MiB pages and
+            # 4096-value encode batches mean fewer, larger encoding calls per column
+            with pq.ParquetWriter(filepath, table.schema, compression='zstd', compression_level=1,
+                                  use_dictionary=True, write_statistics=True,
+                                  data_page_size=1 << 20, write_batch_size=4096) as writer:
+                for batch in table.to_batches(max_chunksize=row_group_size):
+                    writer.write_batch(batch, row_group_size=row_group_size)
 
             # Get file size
             file_size = os.path.getsize(filepath)
 
-            self.logger.info(f"Data saved successfully to parquet: {filepath}")
-            self.logger.info(f"Shape: {df_cleaned.shape}, File size: {file_size} bytes")
+            self.logger.info("Data saved successfully to parquet: %s", filepath)
+            self.logger.info("Shape: %s, File size: %s bytes", table.shape, file_size)
 
             return {
                 'success': True,
                 'filepath': filepath,
                 'file_size': file_size,
-                'records_count': len(df_cleaned),
-                'columns': df_cleaned.columns.tolist(),
-                'shape': df_cleaned.shape,
+                'records_count': table.num_rows,
+                'columns': table.column_names,
+                'shape': table.shape,
                 'format': 'parquet',
+                # In-memory copy of what was written, so callers can skip re-reading the file
+                'table': table,
                 'error': None
             }
 
@@ -225,14 +276,70 @@ class DataLoader:
                 'error': error_message
             }
 
-    def save_to_database(self, data, db_path='data/processed/etl_results.sqlite', sql_dump_path='etl_results_dump.sql', table_name='accounts'):
+    @staticmethod
+    def _quote_identifier(name: str) -> str:
+        """Quote a table/column name for SQLite"""
+        return '"' + str(name).replace('"', '""') + '"'
+
+    @staticmethod
+    def _sqlite_rows(df: pd.DataFrame):
+        """
+        Convert a DataFrame column by column into SQLite-ready row tuples
+
+        Args:
+            df: DataFrame to convert
+
+        Returns:
+            Iterator of tuples with NaN/NA as None and numpy scalars as Python values
+        """
+        columns = []
+        for col in df.columns:
+            series = df[col]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                # Same text representation to_sql uses for datetimes
+                values = [None if pd.isna(v) else v.isoformat(' ') for v in series.dt.to_pydatetime()]
+            else:
+                values = series.astype(object).where(series.notna(), None).tolist()
+            columns.append(values)
+        return zip(*columns)
+
+    # Statements batched per write() call when exporting the SQL dump
+    DUMP_WRITE_BATCH = 2048
+
+    @classmethod
+    def _write_sql_dump(cls, conn, sql_dump_path: str, compress: bool = False) -> None:
+        """
+        Write conn.iterdump() to a file in large batched writes
+
+        Args:
+            conn: sqlite3 connection to dump
+            sql_dump_path: Path of the dump file
+            compress: If True, gzip the dump (fast level 1)
+        """
+        if compress:
+            f = gzip.open(sql_dump_path, 'wb', compresslevel=1)
+        else:
+            f = open(sql_dump_path, 'wb', buffering=1 << 20)
+        with f:
+            batch = []
+            for line in conn.iterdump():
+                batch.append(line)
+                if len(batch) >= cls.DUMP_WRITE_BATCH:
+                    f.write(('\n'.join(batch) + '\n').encode('utf-8'))
+                    batch.clear()
+            if batch:
+                f.write(('\n'.join(batch) + '\n').encode('utf-8'))
+
+    def save_to_database(self, data, db_path='data/processed/etl_results.sqlite', sql_dump_path='etl_results_dump.sql', table_name='accounts',
+                         compress_dump=False):
         """
         Save data to SQLite database and export SQL dump
         Args:
             data: Data to save (list of dicts, dict, or DataFrame)
             db_path: Path to SQLite database file
-            sql_dump_path: Path to export SQL dump file
+            sql_dump_path: Path to export SQL dump file (None to skip the dump)
             table_name: Name of the table to save data
+            compress_dump: If True, write the SQL dump gzip-compressed
         Returns:
             Dict with operation result and metadata
         """
@@ -250,18 +357,42 @@ class DataLoader:
             else:
                 df = data
 
-            # Save DataFrame to SQLite
-            conn = sqlite3.connect(db_path)
-            df.to_sql(table_name, conn, if_exists='replace', index=False)
+            # Build the table in an in-memory database, then copy it page by page
+            # to disk with a single backup() instead of journaling every insert
+            conn = sqlite3.connect(':memory:')
+
+            # Drop, create and bulk insert in a single transaction; the table
+            # schema is the same one to_sql would generate
+            quoted_table = self._quote_identifier(table_name)
+            placeholders = ', '.join('?' * len(df.columns))
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(f'DROP TABLE IF EXISTS {quoted_table}')
+            conn.execute(pd.io.sql.get_schema(df, table_name, con=conn))
+            conn.executemany(f'INSERT INTO {quoted_table} VALUES ({placeholders})', self._sqlite_rows(df))
+            conn.commit()
+
+            # The on-disk DB is rebuilt on every run, so the copy skips fsyncs. It keeps the
+            # default rollback journal (DELETE also converts a file left in WAL mode by an
+            # older run), so no -wal/-shm files stay next to it; the read-only query
+            # readers share the file without blocking each other either way
+            disk_conn = sqlite3.connect(db_path)
+            try:
+                disk_conn.execute('PRAGMA synchronous=OFF')
+                disk_conn.execute('PRAGMA journal_mode=DELETE')
+                conn.backup(disk_conn)
+            finally:
+                disk_conn.close()
 
             # Export SQL dump
-            with open(sql_dump_path, 'w', encoding='utf-8') as f:
-                for line in conn.iterdump():
-                    f.write(f'{line}\n')
+            if sql_dump_path:
+                self._write_sql_dump(conn, sql_dump_path, compress=compress_dump)
 
             conn.close()
 
-            self.logger.info(f"Data saved to SQLite: {db_path} and SQL dump: {sql_dump_path}")
+            if sql_dump_path:
+                self.logger.info("Data saved to SQLite: %s and SQL dump: %s", db_path, sql_dump_path)
+            else:
+                self.logger.info("Data saved to SQLite: %s", db_path)
             return {
                 'success': True,
                 'db_path': db_path,
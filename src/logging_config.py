@@ -1,5 +1,6 @@
 from rich.logging import RichHandler
 from rich.console import Console
+from functools import lru_cache
 import logging
 
 def setup_rich_logging(level=logging.INFO):
@@ -57,27 +58,30 @@ def setup_rich_logging(level=logging.INFO):
 
     return console
 
+@lru_cache(maxsize=None)
+def _shared_rich_handler() -> RichHandler:
+    """Handler Rich (con su Console) creado una sola vez y compartido por get_rich_logger"""
+    console = Console(
+        width=120,
+        force_terminal=True,
+        color_system="auto"
+    )
+
+    return RichHandler(
+        console=console,
+        rich_tracebacks=True,
+        show_path=False,
+        show_time=True,
+        markup=True,
+        show_level=True
+    )
+
 def get_rich_logger(name: str):
     """Obtiene un logger configurado para usar con Rich"""
     logger = logging.getLogger(name)
 
     if not logger.handlers:
-        console = Console(
-            width=120,
-            force_terminal=True,
-            color_system="auto"
-        )
-
-        rich_handler = RichHandler(
-            console=console,
-            rich_tracebacks=True,
-            show_path=False,
-            show_time=True,
-            markup=True,
-            show_level=True
-        )
-
-        logger.addHandler(rich_handler)
+        logger.addHandler(_shared_rich_handler())
         logger.setLevel(logging.INFO)
         logger.propagate = False
 
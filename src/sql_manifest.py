@@ -0,0 +1,57 @@
+"""
+SQL query discovery
+Cached list of the .sql files in the queries directory
+"""
+
+import json
+import os
+from typing import Iterable, List
+
+MANIFEST_NAME = '.manifest.json'
+
+
+def load_sql_manifest(queries_dir: str, exclude: Iterable[str] = ('etl_results_dump.sql',)) -> List[str]:
+    """
+    List the .sql query files in a directory, cached in a JSON manifest
+
+    The manifest stores the directory mtime; adding, removing or renaming a
+    file changes it, so the directory is only rescanned when its listing changed.
+
+    Args:
+        queries_dir: Directory containing the SQL files
+        exclude: File names to leave out (e.g. the SQL dump)
+
+    Returns:
+        Sorted list of paths to the SQL files
+    """
+    manifest_path = os.path.join(queries_dir, MANIFEST_NAME)
+    exclude = set(exclude)
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('mtime') == os.stat(queries_dir).st_mtime and manifest.get('exclude') == sorted(exclude):
+            return [os.path.join(queries_dir, name) for name in manifest['files']]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    try:
+        # Create the manifest before reading the mtime: rewriting an existing
+        # file in place does not touch the directory mtime afterwards
+        open(manifest_path, 'a').close()
+    except OSError:
+        manifest_path = None
+
+    mtime = os.stat(queries_dir).st_mtime
+    with os.scandir(queries_dir) as entries:
+        files = sorted(entry.name for entry in entries
+                       if entry.is_file() and entry.name.endswith('.sql') and entry.name not in exclude)
+
+    if manifest_path:
+        try:
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump({'mtime': mtime, 'exclude': sorted(exclude), 'files': files}, f)
+        except OSError:
+            pass
+
+    return [os.path.join(queries_dir, name) for name in files]
@@ -5,14 +5,43 @@ Implementation of data cleaning, normalization and enrichment
 
 import pandas as pd
 import re
-import logging
 from datetime import datetime, date
-from typing import Dict, Any, List, Union, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple, Union, Optional
 import json
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 from ..logging_config import get_rich_logger
 
+# Patterns compiled once for column-name normalization and amount cleaning
+_CAMEL_CASE_RE = re.compile(r'([A-Z])')
+_LEADING_UNDERSCORE_RE = re.compile(r'^_')
+_MULTI_UNDERSCORE_RE = re.compile(r'_+')
+# Anything but digits, '.' and '-' (also covers currency symbols and thousands separators)
+_NON_NUMERIC_RE = re.compile(r'[^\d.-]')
+# What is left of an amount once cleaned: an optionally negative decimal number
+_AMOUNT_PATTERN = r'^-?(\d+\.?\d*|\.\d+)$'
+# Transaction size classes and the inner edges between them ([0, 10) is 'micro', [1000, inf) 'very_large')
+_SIZE_LABELS = ['micro', 'small', 'medium', 'large', 'very_large']
+_SIZE_BIN_EDGES = np.array([10, 50, 200, 1000], dtype=np.float64)
+# Transaction direction labels, by code (credit > 0, else debit > 0, else neutral)
+_DIRECTION_LABELS = ['credit', 'debit', 'neutral']
+# Category types counted as discretionary spending
+_DISCRETIONARY_TYPES = frozenset({'food_beverage', 'personal_care', 'retail', 'miscellaneous'})
+# Keyword flags on the lowercased transaction description
+_DESCRIPTION_KEYWORD_RES = (
+    ('has_keyword_subscription', re.compile(r'subscription|suscrip|netflix|spotify|itunes|prime|membership')),
+    ('has_atm', re.compile(r'\batm\b')),
+    ('has_transfer', re.compile(r'transfer|transf|zelle|wire|sepa')),
+    ('has_refund_keyword', re.compile(r'refund|reversal|chargeback|reembolso')),
+)
+# Day names in dayofweek order (Monday=0), as returned by Series.dt.day_name()
+_DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+# Nanoseconds per day, to turn datetime64[ns] differences into whole days
+_NS_PER_DAY = 86_400 * 10**9
 
 
 class DataTransformer:
@@ -20,70 +49,100 @@ class DataTransformer:
     Class for transforming and cleaning extracted data
     """
 
+    # Rows per record batch when reading raw parquet files
+    READ_BATCH_SIZE = 65536
+    # Memory-map raw parquet files instead of reading them through a buffered file
+    READ_MEMORY_MAP = True
+    # zstd level for the processed parquet output
+    PROCESSED_ZSTD_LEVEL = 3
+
+    # Standardize specific column names based on your data structure (keys are snake_case names)
+    STANDARDIZATION_MAP = {
+        'category': 'transaction_category',
+        'credit': 'credit_amount',
+        'debit': 'debit_amount',
+        'description': 'transaction_description',
+        'id': 'transaction_id',
+        'transactiondate': 'transaction_date',
+        'transaction_date': 'transaction_date'
+    }
+
+    # Transaction categories mapping for data enrichment
+    # This mapping serves as a simulated lookup table to enrich transaction data
+    # with additional business context and metadata for analytical purposes.
+    #
+    # Design decisions and rationale:
+    # 1. BASED ON REAL DATA: Uses actual category values found in the dataset
+    #    ['Other Services', 'Health Care', 'Payment/Credit', etc.]
+    #
+    # 2. TYPE CLASSIFICATION: Groups categories by business domain/industry
+    #    - 'healthcare': Medical and health-related expenses
+    #    - 'transportation': Travel, fuel, automotive expenses
+    #    - 'food_beverage': Dining, restaurants, food purchases
+    #    - 'utilities': Phone, cable, essential services
+    #    - 'retail': Merchandise and general purchases
+    #    - 'service': Professional and other services
+    #    - 'payment': Credit payments and financial transfers
+    #    - 'fee': Bank fees and interest charges
+    #    - 'travel': Travel-related expenses
+    #    - 'personal_care': Beauty and personal care
+    #    - 'miscellaneous': Uncategorized expenses
+    #
+    # 3. TAX DEDUCTIBILITY: Indicates if expenses are typically tax-deductible
+    #    True for: Healthcare, Transportation (business use), Travel
+    #    False for: Personal expenses like dining, beauty, entertainment
+    #    Based on common tax regulations (US/Europe standards)
+    #
+    # 4. PRIORITY LEVELS: Risk and compliance priority for financial analysis
+    #    'high': Critical for compliance, health monitoring (Health Care, Fees, Payments)
+    #    'medium': Regular operational expenses (Utilities, Transportation, Services)
+    #    'low': Discretionary/lifestyle expenses (Dining, Beauty, Entertainment)
+    #
+    # This enrichment enables:
+    # - Automated expense categorization and reporting
+    # - Tax preparation and deduction identification
+    # - Spending pattern analysis by category type
+    # - Risk assessment and anomaly detection
+    # - Business intelligence and financial planning
+    TRANSACTION_CATEGORIES_MAPPING = {
+        'Other Services': {'type': 'service', 'tax_deductible': False, 'priority': 'medium'},
+        'Health Care': {'type': 'healthcare', 'tax_deductible': True, 'priority': 'high'},
+        'Payment/Credit': {'type': 'payment', 'tax_deductible': False, 'priority': 'high'},
+        'Merchandise': {'type': 'retail', 'tax_deductible': False, 'priority': 'low'},
+        'Phone/Cable': {'type': 'utilities', 'tax_deductible': False, 'priority': 'medium'},
+        'Fee/Interest Charge': {'type': 'fee', 'tax_deductible': False, 'priority': 'high'},
+        'Other': {'type': 'miscellaneous', 'tax_deductible': False, 'priority': 'low'},
+        'Dining': {'type': 'food_beverage', 'tax_deductible': False, 'priority': 'low'},
+        'Gas/Automotive': {'type': 'transportation', 'tax_deductible': True, 'priority': 'medium'},
+        'Other Travel': {'type': 'travel', 'tax_deductible': True, 'priority': 'medium'},
+        'restaurants': {'type': 'food_beverage', 'tax_deductible': False, 'priority': 'low'},
+        'beauty': {'type': 'personal_care', 'tax_deductible': False, 'priority': 'low'},
+        'fuel': {'type': 'transportation', 'tax_deductible': True, 'priority': 'medium'},
+        'air': {'type': 'transportation', 'tax_deductible': True, 'priority': 'medium'},
+        'gaz': {'type': 'transportation', 'tax_deductible': True, 'priority': 'medium'},
+        'food': {'type': 'food_beverage', 'tax_deductible': False, 'priority': 'low'},
+        'taxi': {'type': 'transportation', 'tax_deductible': True, 'priority': 'medium'}
+    }
+
+    # Same mapping as a lookup table indexed by category, one 'category_<key>' column per attribute,
+    # followed by the values used for unmapped categories. Built once, shared by every instance
+    _CATEGORY_LOOKUP = pd.DataFrame.from_dict(TRANSACTION_CATEGORIES_MAPPING, orient='index').add_prefix('category_')
+    _CATEGORY_DEFAULTS = {'category_type': 'unknown', 'category_tax_deductible': False, 'category_priority': 'low'}
+    _CATEGORICAL_COLUMNS = ('category_type', 'category_priority')
+
     def __init__(self):
         """
         Initialize the data transformer
         """
-        # Configure logging
-        logging.basicConfig(level=logging.INFO)
+        # Logging handlers are configured by the application entrypoint (see logging_config)
         self.logger = get_rich_logger(__name__)
 
-        # Transaction categories mapping for data enrichment
-        # This mapping serves as a simulated lookup table to enrich transaction data
-        # with additional business context and metadata for analytical purposes.
-        #
-        # Design decisions and rationale:
-        # 1. BASED ON REAL DATA: Uses actual category values found in the dataset
-        #    ['Other Services', 'Health Care', 'Payment/Credit', etc.]
-        #
-        # 2. TYPE CLASSIFICATION: Groups categories by business domain/industry
-        #    - 'healthcare': Medical and health-related expenses
-        #    - 'transportation': Travel, fuel, automotive expenses
-        #    - 'food_beverage': Dining, restaurants, food purchases
-        #    - 'utilities': Phone, cable, essential services
-        #    - 'retail': Merchandise and general purchases
-        #    - 'service': Professional and other services
-        #    - 'payment': Credit payments and financial transfers
-        #    - 'fee': Bank fees and interest charges
-        #    - 'travel': Travel-related expenses
-        #    - 'personal_care': Beauty and personal care
-        #    - 'miscellaneous': Uncategorized expenses
-        #
-        # 3. TAX DEDUCTIBILITY: Indicates if expenses are typically tax-deductible
-        #    True for: Healthcare, Transportation (business use), Travel
-        #    False for: Personal expenses like dining, beauty, entertainment
-        #    Based on common tax regulations (US/Europe standards)
-        #
-        # 4. PRIORITY LEVELS: Risk and compliance priority for financial analysis
-        #    'high': Critical for compliance, health monitoring (Health Care, Fees, Payments)
-        #    'medium': Regular operational expenses (Utilities, Transportation, Services)
-        #    'low': Discretionary/lifestyle expenses (Dining, Beauty, Entertainment)
-        #
-        # This enrichment enables:
-        # - Automated expense categorization and reporting
-        # - Tax preparation and deduction identification
-        # - Spending pattern analysis by category type
-        # - Risk assessment and anomaly detection
-        # - Business intelligence and financial planning
-        self.transaction_categories_mapping = {
-            'Other Services': {'type': 'service', 'tax_deductible': False, 'priority': 'medium'},
-            'Health Care': {'type': 'healthcare', 'tax_deductible': True, 'priority': 'high'},
-            'Payment/Credit': {'type': 'payment', 'tax_deductible': False, 'priority': 'high'},
-            'Merchandise': {'type': 'retail', 'tax_deductible': False, 'priority': 'low'},
-            'Phone/Cable': {'type': 'utilities', 'tax_deductible': False, 'priority': 'medium'},
-            'Fee/Interest Charge': {'type': 'fee', 'tax_deductible': False, 'priority': 'high'},
-            'Other': {'type': 'miscellaneous', 'tax_deductible': False, 'priority': 'low'},
-            'Dining': {'type': 'food_beverage', 'tax_deductible': False, 'priority': 'low'},
-            'Gas/Automotive': {'type': 'transportation', 'tax_deductible': True, 'priority': 'medium'},
-            'Other Travel': {'type': 'travel', 'tax_deductible': True, 'priority': 'medium'},
-            'restaurants': {'type': 'food_beverage', 'tax_deductible': False, 'priority': 'low'},
-            'beauty': {'type': 'personal_care', 'tax_deductible': False, 'priority': 'low'},
-            'fuel': {'type': 'transportation', 'tax_deductible': True, 'priority': 'medium'},
-            'air': {'type': 'transportation', 'tax_deductible': True, 'priority': 'medium'},
-            'gaz': {'type': 'transportation', 'tax_deductible': True, 'priority': 'medium'},
-            'food': {'type': 'food_beverage', 'tax_deductible': False, 'priority': 'low'},
-            'taxi': {'type': 'transportation', 'tax_deductible': True, 'priority': 'medium'}
-        }
+        # Category mapping used for enrichment (class-level, see TRANSACTION_CATEGORIES_MAPPING)
+        self.transaction_categories_mapping = self.TRANSACTION_CATEGORIES_MAPPING
+
+        # Datetimes parsed by the last convert_date_formats call, by column, so later stages
+        # can derive temporal features without parsing the formatted strings again
+        self._parsed_dates: Dict[str, pd.Series] = {}
 
     def normalize_column_names(self, data: Union[List[Dict], pd.DataFrame]) -> pd.DataFrame:
         """
@@ -96,33 +155,14 @@ class DataTransformer:
             DataFrame with normalized column names
         """
         # Convert to DataFrame if needed
+        # (rename below returns a new frame, so the input needs no copy)
         if isinstance(data, list):
             df = pd.DataFrame(data)
         else:
-            df = data.copy()
-
-        # Create mapping for column name normalization
-        column_mapping = {}
+            df = data
 
-        for col in df.columns:
-            # Convert to snake_case
-            normalized = re.sub(r'([A-Z])', r'_\1', col).lower()
-            normalized = re.sub(r'^_', '', normalized)  # Remove leading underscore
-            normalized = re.sub(r'_+', '_', normalized)  # Remove multiple underscores
-
-            # Standardize specific column names based on your data structure
-            standardization_map = {
-                'category': 'transaction_category',
-                'credit': 'credit_amount',
-                'debit': 'debit_amount',
-                'description': 'transaction_description',
-                'id': 'transaction_id',
-                'transactiondate': 'transaction_date',
-                'transaction_date': 'transaction_date'
-            }
-
-            final_name = standardization_map.get(normalized, normalized)
-            column_mapping[col] = final_name
+        # Mapping for column name normalization (cached per column layout)
+        column_mapping = self._column_mapping(tuple(df.columns))
 
         # Apply column renaming
         df = df.rename(columns=column_mapping)
@@ -130,6 +170,31 @@ class DataTransformer:
         self.logger.info(f"Column normalization completed. Renamed: {column_mapping}")
         return df
 
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _column_mapping(columns: Tuple[str, ...]) -> Dict[str, str]:
+        """
+        Build the column renaming for a column layout; the raw source keeps the same columns
+        from one run to the next, so repeated calls reuse the cached mapping
+
+        Args:
+            columns: Column names of the input frame, in order
+
+        Returns:
+            Dict mapping each original column name to its normalized name (do not modify)
+        """
+        column_mapping = {}
+
+        for col in columns:
+            # Convert to snake_case
+            normalized = _CAMEL_CASE_RE.sub(r'_\1', col).lower()
+            normalized = _LEADING_UNDERSCORE_RE.sub('', normalized)  # Remove leading underscore
+            normalized = _MULTI_UNDERSCORE_RE.sub('_', normalized)  # Remove multiple underscores
+
+            column_mapping[col] = DataTransformer.STANDARDIZATION_MAP.get(normalized, normalized)
+
+        return column_mapping
+
     def convert_date_formats(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Convert date columns to standard YYYY-MM-DD format
@@ -140,17 +205,20 @@ class DataTransformer:
         Returns:
             DataFrame with standardized date formats
         """
-        df_processed = df.copy()
+        # Columns are only replaced, never written in place: a shallow copy leaves the caller's frame untouched
+        df_processed = df.copy(deep=False)
         date_columns = ['transaction_date', 'created_date', 'date', 'updated_date']
+        self._parsed_dates = {}
 
         for col in date_columns:
             if col in df_processed.columns:
                 try:
                     # Handle different date formats
-                    df_processed[col] = pd.to_datetime(df_processed[col], errors='coerce')
+                    parsed = pd.to_datetime(df_processed[col], errors='coerce')
+                    self._parsed_dates[col] = parsed
 
                     # Convert to YYYY-MM-DD format (string)
-                    df_processed[col] = df_processed[col].dt.strftime('%Y-%m-%d')
+                    df_processed[col] = parsed.dt.strftime('%Y-%m-%d')
 
                     # Handle any conversion errors (NaT values)
                     df_processed[col] = df_processed[col].replace('NaT', None)
@@ -172,27 +240,38 @@ class DataTransformer:
         Returns:
             DataFrame with cleaned financial amounts
         """
-        df_processed = df.copy()
+        # Columns are only replaced, never written in place: a shallow copy leaves the caller's frame untouched
+        df_processed = df.copy(deep=False)
         financial_columns = ['credit_amount', 'debit_amount', 'amount', 'balance']
 
         for col in financial_columns:
             if col in df_processed.columns:
                 try:
-                    # Convert to string first to handle mixed types
-                    df_processed[col] = df_processed[col].astype(str)
-
-                    # Replace empty strings and NaN with 0
-                    df_processed[col] = df_processed[col].replace(['', 'nan', 'NaN', 'None'], '0')
-
-                    # Remove currency symbols and clean the data
-                    df_processed[col] = df_processed[col].str.replace(r'[$,€£¥]', '', regex=True)
-                    df_processed[col] = df_processed[col].str.replace(r'[^\d.-]', '', regex=True)
-
-                    # Convert to numeric
-                    df_processed[col] = pd.to_numeric(df_processed[col], errors='coerce').fillna(0)
-
-                    # Round to 2 decimal places for financial precision
-                    df_processed[col] = df_processed[col].round(2)
+                    column = df_processed[col]
+                    if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+                        # Already numeric (e.g. a float64 parquet column): no text cleaning needed.
+                        # Missing and non-finite values become 0, as on the text path
+                        values = column.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+                        values[~np.isfinite(values)] = 0.0
+                        df_processed[col] = np.round(values, 2, out=values)
+                        self.logger.info(f"Financial amount cleaning completed for column: {col}")
+                        continue
+
+                    # Convert to string first to handle mixed types, then clean with Arrow kernels
+                    text = pa.array(column.astype(str), from_pandas=True)
+
+                    # Remove currency symbols and any other non-numeric characters in one pass
+                    text = pc.replace_substring_regex(text, pattern=_NON_NUMERIC_RE.pattern, replacement='')
+
+                    # Convert to numeric: empty ('', 'nan', 'None' once stripped), missing and
+                    # malformed values become 0
+                    valid = pc.match_substring_regex(text, pattern=_AMOUNT_PATTERN)
+                    amounts = pc.cast(pc.if_else(valid, text, pa.scalar(None, text.type)), pa.float64())
+                    values = amounts.to_numpy(zero_copy_only=False, writable=True)
+                    values[np.isnan(values)] = 0.0
+
+                    # Round to 2 decimal places for financial precision (in place, on the one buffer)
+                    df_processed[col] = np.round(values, 2, out=values)
 
                     self.logger.info(f"Financial amount cleaning completed for column: {col}")
 
@@ -211,85 +290,106 @@ class DataTransformer:
         Returns:
             DataFrame enriched with transaction category details
         """
-        df_enriched = df.copy()
-
-        # Enriquecer con información de categorías de transacciones
-        for category, info in self.transaction_categories_mapping.items():
-            mask = df_enriched['transaction_category'] == category
-            for key, value in info.items():
-                df_enriched.loc[mask, f'category_{key}'] = value
-
-        # Manejar categorías no mapeadas
-        unmapped_mask = ~df_enriched['transaction_category'].isin(self.transaction_categories_mapping.keys())
-        df_enriched.loc[unmapped_mask, 'category_type'] = 'unknown'
-        df_enriched.loc[unmapped_mask, 'category_tax_deductible'] = False
-        df_enriched.loc[unmapped_mask, 'category_priority'] = 'low'
+        # Columns are only replaced, never written in place: a shallow copy leaves the caller's frame untouched
+        df_enriched = df.copy(deep=False)
+
+        # Enriquecer con información de categorías de transacciones: las categorías distintas
+        # (factorize) se buscan por posición en la tabla de categorías y cada atributo se resuelve
+        # una vez por categoría distinta; las filas lo toman por su código. Las no mapeadas y las
+        # faltantes (código -1 -> última posición) reciben los valores por defecto
+        codes, uniques = pd.factorize(df_enriched['transaction_category'])
+        positions = self._CATEGORY_LOOKUP.index.get_indexer(uniques)
+        mapped = positions >= 0
+        for col in self._CATEGORY_LOOKUP.columns:
+            by_category = np.full(len(uniques) + 1, self._CATEGORY_DEFAULTS[col], dtype=object)
+            by_category[:-1][mapped] = self._CATEGORY_LOOKUP[col].to_numpy(dtype=object)[positions[mapped]]
+            if col in self._CATEGORICAL_COLUMNS:
+                # Low-cardinality labels are stored as categoricals (int8 codes + a few categories)
+                label_codes, labels = pd.factorize(by_category)
+                df_enriched[col] = pd.Categorical.from_codes(label_codes[codes], categories=pd.Index(labels))
+            else:
+                df_enriched[col] = by_category[codes]
 
         self.logger.info("Transaction category enrichment completed.")
         return df_enriched
 
-    def add_custom_validations_and_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_custom_validations_and_features(self, df: pd.DataFrame,
+                                            parsed_dates: Optional[pd.Series] = None) -> pd.DataFrame:
         """
         Add custom validations and computed features based on transaction data
 
         Args:
             df: Input DataFrame
+            parsed_dates: transaction_date as parsed by convert_date_formats (parsed again when omitted)
 
         Returns:
             DataFrame with additional validations and computed fields
         """
-        df_validated = df.copy()
+        # Columns are only replaced, never written in place: a shallow copy leaves the caller's frame untouched
+        df_validated = df.copy(deep=False)
 
         # 1. Calcular balance neto de la transacción
+        # (las features numéricas de las secciones 1-3 se calculan sobre los arrays NumPy de montos)
         if 'credit_amount' in df_validated.columns and 'debit_amount' in df_validated.columns:
-            df_validated['net_transaction_amount'] = (
-                df_validated['credit_amount'] - abs(df_validated['debit_amount'])
-            )
-
-            # Dirección y variables derivadas básicas
-            df_validated['transaction_direction'] = np.where(
-                df_validated['credit_amount'] > 0, 'credit',
-                np.where(df_validated['debit_amount'] > 0, 'debit', 'neutral')
+            credit = df_validated['credit_amount'].to_numpy(dtype=np.float64, na_value=np.nan)
+            debit = df_validated['debit_amount'].to_numpy(dtype=np.float64, na_value=np.nan)
+            net = np.abs(debit)
+            df_validated['net_transaction_amount'] = np.subtract(credit, net, out=net)
+
+            # Dirección y variables derivadas básicas (códigos int8 de un categórico, sin arrays de strings)
+            direction_codes = np.where(credit > 0, 0, np.where(debit > 0, 1, 2)).astype(np.int8)
+            df_validated['transaction_direction'] = pd.Categorical.from_codes(
+                direction_codes, categories=_DIRECTION_LABELS
             )
 
         # Monto absoluto y flags de ingreso/gasto
         if 'net_transaction_amount' in df_validated.columns:
-            df_validated['amount_abs'] = df_validated['net_transaction_amount'].abs()
-            df_validated['is_income'] = df_validated['net_transaction_amount'] > 0
-            df_validated['is_expense'] = df_validated['net_transaction_amount'] < 0
+            net = df_validated['net_transaction_amount'].to_numpy(dtype=np.float64, na_value=np.nan)
+            amount_abs = np.abs(net)
+            df_validated['amount_abs'] = amount_abs
+            df_validated['is_income'] = net > 0
+            df_validated['is_expense'] = net < 0
 
         # 2. Clasificar transacciones por monto
         if 'net_transaction_amount' in df_validated.columns:
-            df_validated['transaction_size'] = pd.cut(
-                abs(df_validated['net_transaction_amount']),
-                bins=[0, 10, 50, 200, 1000, float('inf')],
-                labels=['micro', 'small', 'medium', 'large', 'very_large'],
-                right=False
+            # Same bins as pd.cut(bins=[0, 10, 50, 200, 1000, inf], right=False): one binary search per
+            # value over the inner edges; NaN and inf fall outside every bin
+            size_codes = np.searchsorted(_SIZE_BIN_EDGES, amount_abs, side='right').astype(np.int8)
+            size_codes[~np.isfinite(amount_abs)] = -1
+            df_validated['transaction_size'] = pd.Categorical.from_codes(
+                size_codes, categories=_SIZE_LABELS, ordered=True
             )
 
         # 3. Detectar transacciones anómalas (valores extremos)
         if 'net_transaction_amount' in df_validated.columns:
-            Q1 = df_validated['net_transaction_amount'].quantile(0.25)
-            Q3 = df_validated['net_transaction_amount'].quantile(0.75)
+            # Both quartiles from a single quantile call (one sort of the column)
+            Q1, Q3 = df_validated['net_transaction_amount'].quantile([0.25, 0.75])
             IQR = Q3 - Q1
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
 
-            df_validated['is_anomaly'] = (
-                (df_validated['net_transaction_amount'] < lower_bound) |
-                (df_validated['net_transaction_amount'] > upper_bound)
-            )
+            df_validated['is_anomaly'] = (net < lower_bound) | (net > upper_bound)
 
         # 4. Agregar información temporal
         if 'transaction_date' in df_validated.columns:
-            df_processed_dates = pd.to_datetime(df_validated['transaction_date'], errors='coerce')
+            if (parsed_dates is not None and len(parsed_dates) == len(df_validated)
+                    and pd.api.types.is_datetime64_dtype(parsed_dates)):
+                # Day precision, like the YYYY-MM-DD strings the column now holds
+                df_processed_dates = pd.Series(parsed_dates.dt.normalize().to_numpy(), index=df_validated.index)
+            else:
+                df_processed_dates = pd.to_datetime(df_validated['transaction_date'], errors='coerce')
+            # Each calendar field is read once from the datetimes; the quarter and the weekend
+            # flag are derived from the month and weekday numbers instead of another pass
+            transaction_month = df_processed_dates.dt.month
+            weekday_codes = df_processed_dates.dt.dayofweek.fillna(-1).astype(np.int8).to_numpy()
             df_validated['transaction_year'] = df_processed_dates.dt.year
-            df_validated['transaction_month'] = df_processed_dates.dt.month
-            df_validated['transaction_day_of_week'] = df_processed_dates.dt.day_name()
-            df_validated['transaction_quarter'] = df_processed_dates.dt.quarter
+            df_validated['transaction_month'] = transaction_month
+            # Day names as categorical codes from dayofweek (NaT -> -1, missing) instead of one string per row
+            df_validated['transaction_day_of_week'] = pd.Categorical.from_codes(weekday_codes, categories=_DAY_NAMES)
+            df_validated['transaction_quarter'] = (transaction_month - 1) // 3 + 1
 
-            # Flags temporales adicionales
-            df_validated['is_weekend'] = df_validated['transaction_day_of_week'].isin(['Saturday', 'Sunday'])
+            # Flags temporales adicionales (sábado = 5, domingo = 6; NaT -> -1 -> False)
+            df_validated['is_weekend'] = weekday_codes >= 5
             df_validated['is_month_end'] = df_processed_dates.dt.is_month_end
             df_validated['is_month_start'] = df_processed_dates.dt.is_month_start
             # isocalendar() returns a DataFrame with week/year/day for pandas >= 1.1
@@ -303,9 +403,15 @@ class DataTransformer:
         df_validated['data_quality_score'] = self._calculate_data_quality_score(df_validated)
 
         # 6. Agregar banderas de negocio
-        df_validated['is_fee_transaction'] = df_validated.get('transaction_category', '').str.contains('Fee', case=False, na=False)
-        df_validated['is_payment_transaction'] = df_validated.get('transaction_category', '').str.contains('Payment', case=False, na=False)
-        df_validated['is_large_transaction'] = abs(df_validated.get('net_transaction_amount', 0)) > 500
+        has_category = 'transaction_category' in df_validated.columns
+        df_validated['is_fee_transaction'] = (
+            self._category_contains(df_validated['transaction_category'], 'Fee') if has_category else False)
+        df_validated['is_payment_transaction'] = (
+            self._category_contains(df_validated['transaction_category'], 'Payment') if has_category else False)
+        if 'net_transaction_amount' in df_validated.columns:
+            df_validated['is_large_transaction'] = df_validated['amount_abs'].gt(500)
+        else:
+            df_validated['is_large_transaction'] = False
 
         # 6.1. Variables de negocio adicionales basadas en categoría
         if 'category_priority' in df_validated.columns:
@@ -314,12 +420,11 @@ class DataTransformer:
         if 'category_tax_deductible' in df_validated.columns:
             df_validated['is_tax_deductible'] = df_validated['category_tax_deductible'].astype(bool)
         if 'category_type' in df_validated.columns:
-            discretionary_types = {'food_beverage', 'personal_care', 'retail', 'miscellaneous'}
-            df_validated['is_discretionary'] = df_validated['category_type'].isin(discretionary_types)
+            df_validated['is_discretionary'] = df_validated['category_type'].isin(_DISCRETIONARY_TYPES)
         if 'category_tax_deductible' in df_validated.columns and 'net_transaction_amount' in df_validated.columns:
             df_validated['tax_deductible_amount'] = np.where(
                 df_validated['category_tax_deductible'].eq(True),
-                df_validated['net_transaction_amount'].abs(),
+                df_validated['amount_abs'],
                 0.0
             )
 
@@ -327,32 +432,51 @@ class DataTransformer:
         if 'transaction_description' in df_validated.columns:
             desc_lower = df_validated['transaction_description'].astype(str).str.lower()
             df_validated['description_length'] = desc_lower.str.len()
-            df_validated['has_keyword_subscription'] = desc_lower.str.contains(
-                r'subscription|suscrip|netflix|spotify|itunes|prime|membership', regex=True, na=False
-            )
-            df_validated['has_atm'] = desc_lower.str.contains(r'\batm\b', regex=True, na=False)
-            df_validated['has_transfer'] = desc_lower.str.contains(r'transfer|transf|zelle|wire|sepa', regex=True, na=False)
-            df_validated['has_refund_keyword'] = desc_lower.str.contains(r'refund|reversal|chargeback|reembolso', regex=True, na=False)
 
-            # Recurrencia por descripción
-            counts = desc_lower.value_counts()
-            df_validated['description_txn_count'] = desc_lower.map(counts).fillna(0).astype(int)
+            # Cada descripción distinta se evalúa una sola vez (factorize); el resultado se reparte
+            # a las filas por su código entero (faltantes: código -1 -> False)
+            desc_codes, desc_uniques = pd.factorize(desc_lower)
+            # Mismo código para una descripción faltante y para '' (clave de duplicados y recurrencia temporal)
+            empty_code = desc_uniques.get_indexer([''])[0]
+            desc_key = np.where(desc_codes >= 0, desc_codes, empty_code if empty_code >= 0 else len(desc_uniques))
+            for flag, pattern in _DESCRIPTION_KEYWORD_RES:
+                matches = np.asarray(desc_uniques.str.contains(pattern, na=False), dtype=bool)
+                df_validated[flag] = np.append(matches, False)[desc_codes]
+
+            # Recurrencia por descripción: conteo por código entero de cada descripción distinta
+            # (bincount) en lugar de value_counts + map sobre strings; faltantes -> 0
+            desc_counts = np.bincount(desc_codes[desc_codes >= 0], minlength=len(desc_uniques))
+            df_validated['description_txn_count'] = np.where(
+                desc_codes >= 0, desc_counts[desc_codes], 0
+            ).astype(np.int64)
             df_validated['is_recurring_description'] = df_validated['description_txn_count'] >= 3
 
-            # Candidatos a duplicado: misma fecha, descripción y monto neto
+            # Candidatos a duplicado: misma fecha, descripción y monto neto. La clave se arma con
+            # códigos enteros y los bits del monto redondeado (distinguen -0.0 de 0.0, como su
+            # texto) en vez de concatenar strings; como antes, las filas sin fecha o sin monto
+            # comparten una misma clave y una descripción faltante cuenta como ''
             if 'net_transaction_amount' in df_validated.columns and 'transaction_date' in df_validated.columns:
-                dup_key = (
-                    df_validated['transaction_date'].astype(str) + '|' +
-                    desc_lower.fillna('') + '|' +
-                    df_validated['net_transaction_amount'].round(2).astype(str)
-                )
-                df_validated['is_duplicate_candidate'] = dup_key.duplicated(keep=False)
+                date_codes = pd.factorize(df_validated['transaction_date'].astype(str))[0]
+                amount = df_validated['net_transaction_amount'].round(2).to_numpy(dtype=np.float64, na_value=np.nan)
+                no_key = (date_codes < 0) | np.isnan(amount)
+                dup_key = pd.DataFrame({
+                    'date': np.where(no_key, -1, date_codes),
+                    'description': np.where(no_key, -1, desc_key),
+                    'amount': np.where(no_key, 0, amount.view(np.int64))
+                })
+                df_validated['is_duplicate_candidate'] = dup_key.duplicated(keep=False).to_numpy()
 
         # 6.3. Estadísticas por categoría para z-score de monto neto
         if 'transaction_category' in df_validated.columns and 'net_transaction_amount' in df_validated.columns:
-            df_validated['cat_net_mean'] = df_validated.groupby('transaction_category')['net_transaction_amount'].transform('mean')
-            df_validated['cat_net_std'] = df_validated.groupby('transaction_category')['net_transaction_amount'].transform('std')
-            df_validated['cat_net_std'] = df_validated['cat_net_std'].replace(0, np.nan)
+            # Grouped on the integer codes of a categorical key instead of hashing the strings
+            # (missing categories stay out of every group and get NaN); both statistics come
+            # from one aggregation and are gathered back to the rows by code
+            category_key = pd.Categorical(df_validated['transaction_category'])
+            stats = (df_validated['net_transaction_amount'].groupby(category_key, observed=True)
+                     .agg(['mean', 'std']).reindex(category_key.categories))
+            category_codes = category_key.codes
+            df_validated['cat_net_mean'] = np.append(stats['mean'].to_numpy(), np.nan)[category_codes]
+            df_validated['cat_net_std'] = np.append(stats['std'].replace(0, np.nan).to_numpy(), np.nan)[category_codes]
             df_validated['cat_net_zscore'] = (
                 (df_validated['net_transaction_amount'] - df_validated['cat_net_mean']) /
                 df_validated['cat_net_std']
@@ -361,39 +485,70 @@ class DataTransformer:
             # Ratio de gasto vs promedio de la categoría
             with np.errstate(divide='ignore', invalid='ignore'):
                 df_validated['spend_vs_category_mean'] = (
-                    df_validated['net_transaction_amount'].abs() / df_validated['cat_net_mean'].abs()
+                    df_validated['amount_abs'] / df_validated['cat_net_mean'].abs()
                 )
             df_validated['spend_vs_category_mean'] = df_validated['spend_vs_category_mean'].replace([np.inf, -np.inf], np.nan).fillna(0.0)
 
         # 6.4. Días desde la transacción anterior con la misma descripción
         if 'transaction_description' in df_validated.columns and 'transaction_date' in df_validated.columns:
             try:
-                tmp_dates = pd.to_datetime(df_validated['transaction_date'], errors='coerce')
-                tmp_desc = df_validated['transaction_description'].astype(str).str.lower().fillna('')
-                df_validated['_row_order'] = np.arange(len(df_validated))
-                df_validated['_tmp_dt'] = tmp_dates
-                df_validated['_tmp_desc'] = tmp_desc
-                df_validated = df_validated.sort_values(['_tmp_desc', '_tmp_dt', '_row_order'])
-                df_validated['days_since_prev_same_desc'] = df_validated.groupby('_tmp_desc')['_tmp_dt'].diff().dt.days
-                df_validated = df_validated.sort_values(['_row_order']).drop(columns=['_row_order', '_tmp_dt', '_tmp_desc'])
+                # Same dates already parsed for the temporal features (section 4)
+                # One stable np.lexsort by description code, then date with NaT last (ties keep row
+                # order); each row is diffed against the previous row of its group in sorted order
+                # and the result is scattered back to the original row positions
+                dt_ns = df_processed_dates.to_numpy(dtype='datetime64[ns]')
+                is_nat = np.isnat(dt_ns)
+                dt_ns = dt_ns.view(np.int64)
+                order = np.lexsort((dt_ns, is_nat, desc_key))
+                sorted_desc, sorted_dt, sorted_nat = desc_key[order], dt_ns[order], is_nat[order]
+
+                has_prev = (sorted_desc[1:] == sorted_desc[:-1]) & ~sorted_nat[1:] & ~sorted_nat[:-1]
+                days_sorted = np.full(len(order), np.nan)
+                days_sorted[1:][has_prev] = (sorted_dt[1:][has_prev] - sorted_dt[:-1][has_prev]) // _NS_PER_DAY
+
+                days = np.empty_like(days_sorted)
+                days[order] = days_sorted
+                df_validated['days_since_prev_same_desc'] = days
             except Exception:
                 df_validated['days_since_prev_same_desc'] = pd.NA
 
         # 6.5. Banderas de reembolso (refund)
         if 'net_transaction_amount' in df_validated.columns:
             has_refund_kw = df_validated['has_refund_keyword'] if 'has_refund_keyword' in df_validated.columns else False
-            is_payment_credit = df_validated.get('transaction_category', '').str.contains('Payment/Credit', case=False, na=False)
+            is_payment_credit = (self._category_contains(df_validated['transaction_category'], 'Payment/Credit')
+                                 if 'transaction_category' in df_validated.columns else False)
             df_validated['is_refund'] = (
                 (has_refund_kw.astype(bool)) |
                 (is_payment_credit & (df_validated['net_transaction_amount'] > 0))
             )
 
         # 7. Agregar timestamp de procesamiento
-        df_validated['processed_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Same value for every row: one category instead of N copies of the string
+        processed_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        df_validated['processed_at'] = pd.Categorical.from_codes(
+            np.zeros(len(df_validated), dtype=np.int8), categories=[processed_at]
+        )
 
         self.logger.info("Custom validations and features completed")
         return df_validated
 
+    @staticmethod
+    def _category_contains(categories: pd.Series, text: str) -> np.ndarray:
+        """
+        Case-insensitive substring flag for a low-cardinality column, matched once per distinct value
+
+        Args:
+            categories: Column to check (e.g. transaction_category)
+            text: Substring to look for
+
+        Returns:
+            Boolean array, False for missing values
+        """
+        codes, uniques = pd.factorize(categories)
+        matches = np.asarray(uniques.str.contains(text, case=False, regex=False, na=False), dtype=bool)
+        # Code -1 (missing) picks the trailing False
+        return np.append(matches, False)[codes]
+
     def _calculate_data_quality_score(self, df: pd.DataFrame) -> pd.Series:
         """
         Calculate a data quality score for each record (0-100)
@@ -404,77 +559,114 @@ class DataTransformer:
         Returns:
             Series with quality scores
         """
-        scores = pd.Series(100.0, index=df.index)  # Start with perfect score
+        # Penalties accumulate in place on one array; the score is 100 minus the total
+        columns = set(df.columns)
+        penalties = np.zeros(len(df))
 
         # Deduct points for missing critical fields
         critical_fields = ['transaction_id', 'transaction_category', 'transaction_date']
         for field in critical_fields:
-            if field in df.columns:
-                scores -= df[field].isna() * 20  # -20 points for missing critical field
+            if field in columns:
+                penalties += df[field].isna().to_numpy() * 20  # -20 points for missing critical field
 
         # Deduct points for missing amounts (both credit and debit empty)
-        if 'credit_amount' in df.columns and 'debit_amount' in df.columns:
-            both_empty = (df['credit_amount'] == 0) & (df['debit_amount'] == 0)
-            scores -= both_empty * 15  # -15 points for no transaction amount
+        if 'credit_amount' in columns and 'debit_amount' in columns:
+            both_empty = (df['credit_amount'].to_numpy() == 0) & (df['debit_amount'].to_numpy() == 0)
+            penalties += both_empty * 15  # -15 points for no transaction amount
 
         # Deduct points for missing transaction description
-        if 'transaction_description' in df.columns:
-            scores -= df['transaction_description'].isna() * 5  # -5 points for missing description
+        if 'transaction_description' in columns:
+            penalties += df['transaction_description'].isna().to_numpy() * 5  # -5 points for missing description
 
         # Deduct points for anomalous transactions (might indicate data errors)
-        if 'is_anomaly' in df.columns:
-            scores -= df['is_anomaly'] * 10  # -10 points for anomalous values
+        if 'is_anomaly' in columns:
+            penalties += df['is_anomaly'].to_numpy(dtype=bool) * 10  # -10 points for anomalous values
 
-        return scores.clip(0, 100)  # Ensure scores are between 0-100
+        return pd.Series(np.clip(100.0 - penalties, 0, 100), index=df.index)  # Ensure scores are between 0-100
 
-    def transform_data(self, data: Union[List[Dict], Dict]) -> List[Dict]:
+    def transform_df(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Main transformation method that applies all transformations
+        Apply all transformations to a DataFrame of raw records
 
         Args:
-            data: Input data (transaction data)
+            df: Raw transaction data
 
         Returns:
-            Transformed data as list of dictionaries
+            Transformed DataFrame (raises on failure)
         """
-        try:
-            self.logger.info("Starting data transformation process...")
+        self.logger.info("Starting data transformation process...")
+        self.logger.info(f"Initial data shape: {df.shape}")
 
-            # Convert to DataFrame
-            if isinstance(data, dict):
-                data = [data]
+        # 1. Normalize column names
+        df = self.normalize_column_names(df)
 
-            df = pd.DataFrame(data)
-            self.logger.info(f"Initial data shape: {df.shape}")
+        # 2. Convert date formats
+        df = self.convert_date_formats(df)
 
-            # 1. Normalize column names
-            df = self.normalize_column_names(df)
+        # 3. Clean financial amounts
+        df = self.clean_financial_amounts(df)
 
-            # 2. Convert date formats
-            df = self.convert_date_formats(df)
+        # 4. Enrich with transaction categories (SOLO ESTO QUEDA)
+        df = self.enrich_with_transaction_categories(df)
 
-            # 3. Clean financial amounts
-            df = self.clean_financial_amounts(df)
+        # 5. Add custom validations and features
+        df = self.add_custom_validations_and_features(df, parsed_dates=self._parsed_dates.get('transaction_date'))
 
-            # 4. Enrich with transaction categories (SOLO ESTO QUEDA)
-            df = self.enrich_with_transaction_categories(df)
+        self.logger.info(f"Transformation completed. Final data shape: {df.shape}")
+        self.logger.info(f"Columns after transformation: {list(df.columns)}")
 
-            # 5. Add custom validations and features
-            df = self.add_custom_validations_and_features(df)
+        return df
 
-            # Convert back to list of dictionaries
-            result = df.to_dict('records')
+    def transform_data(self, data: Union[List[Dict], Dict]) -> List[Dict]:
+        """
+        Main transformation method that applies all transformations
 
-            self.logger.info(f"Transformation completed. Final data shape: {df.shape}")
-            self.logger.info(f"Columns after transformation: {list(df.columns)}")
+        Args:
+            data: Input data (transaction data)
 
-            return result
+        Returns:
+            Transformed data as list of dictionaries
+        """
+        try:
+            # Convert to DataFrame
+            if isinstance(data, dict):
+                data = [data]
+
+            # Convert back to list of dictionaries
+            return self.transform_df(pd.DataFrame(data)).to_dict('records')
 
         except Exception as e:
             self.logger.error(f"Error in data transformation: {str(e)}")
             # Return original data if transformation fails
             return data if isinstance(data, list) else [data]
 
+    @staticmethod
+    def _as_plain_columns(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Give the columns the plain dtypes they get when rebuilt from records, as the
+        processed output used to be: categoricals hold their values, nullable and narrow
+        integers become int64 (float64 when missing values), narrow floats float64
+        and object columns are re-inferred
+
+        Args:
+            df: Transformed DataFrame
+
+        Returns:
+            DataFrame with plain column dtypes
+        """
+        df_plain = df.copy(deep=False)
+        for col in df_plain.columns:
+            series = df_plain[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                df_plain[col] = series.astype(series.cat.categories.dtype)
+            elif pd.api.types.is_extension_array_dtype(series.dtype) and pd.api.types.is_integer_dtype(series.dtype):
+                df_plain[col] = series.astype('float64' if series.isna().any() else 'int64')
+            elif series.dtype == object:
+                df_plain[col] = series.infer_objects()
+            elif series.dtype.kind in 'iuf' and series.dtype.itemsize < 8:
+                df_plain[col] = series.astype('float64' if series.dtype.kind == 'f' else 'int64')
+        return df_plain
+
     def clean_data(self, data: Union[List[Dict], Dict]) -> List[Dict]:
         """
         Clean and validate data (basic cleaning without enrichment)
@@ -516,40 +708,64 @@ class DataTransformer:
             self.logger.error(f"Error in data cleaning: {str(e)}")
             return data if isinstance(data, list) else [data]
 
-    def read_from_raw_parquet(self, filepath: str) -> List[Dict]:
+    def read_from_raw_parquet(self, filepath: str, columns: Optional[List[str]] = None) -> List[Dict]:
         """
         Read data from parquet files in data/raw directory
 
         Args:
             filepath: Path to the parquet file (e.g., 'data/raw/accounts_20250917_232249.parquet')
+            columns: Columns to read (all when None); the others are not decoded
 
         Returns:
             Data as list of dictionaries
         """
         try:
-            import os
+            # Convert to list of dictionaries
+            return self._read_raw_frame(filepath, columns).to_dict('records')
 
-            # Check if file exists
-            if not os.path.exists(filepath):
-                raise FileNotFoundError(f"File not found: {filepath}")
+        except Exception as e:
+            self.logger.error(f"Error reading parquet file {filepath}: {str(e)}")
+            return []
 
-            # Read parquet file
-            df = pd.read_parquet(filepath)
+    def _read_raw_frame(self, filepath: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read a raw parquet file into a DataFrame
 
-            # Convert to list of dictionaries
-            data = df.to_dict('records')
+        Args:
+            filepath: Path to the parquet file
+            columns: Columns to read (all when None); the others are not decoded
 
-            self.logger.info(f"Successfully read {len(data)} records from {filepath}")
-            self.logger.info(f"Columns found: {list(df.columns)}")
+        Returns:
+            DataFrame with the raw records (raises if the file cannot be read)
+        """
+        import os
 
-            return data
+        # Check if file exists
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"File not found: {filepath}")
+
+        # Read parquet file in large record batches (the pyarrow default is
+        # much smaller) and convert to pandas once
+        parquet_file = pq.ParquetFile(filepath, memory_map=self.READ_MEMORY_MAP)
+        schema = parquet_file.schema_arrow
+        if columns is not None:
+            # Column projection: only the requested column chunks are read and decoded
+            schema = pa.schema([schema.field(name) for name in columns])
+        table = pa.Table.from_batches(
+            parquet_file.iter_batches(batch_size=self.READ_BATCH_SIZE, columns=columns, use_threads=True), schema=schema
+        )
+        # The table is the only owner of the Arrow buffers: self_destruct frees each column
+        # as soon as it is converted, so the file is never held twice (Arrow + pandas)
+        df = table.to_pandas(self_destruct=True, split_blocks=True)
+        del table
+
+        self.logger.info(f"Successfully read {len(df)} records from {filepath}")
+        self.logger.info(f"Columns found: {list(df.columns)}")
 
-        except Exception as e:
-            self.logger.error(f"Error reading parquet file {filepath}: {str(e)}")
-            return []
+        return df
 
     def transform_from_raw_file(self, raw_filepath: str, save_processed: bool = False,
-                               processed_format: str = 'parquet') -> Dict[str, Any]:
+                               processed_format: str = 'parquet', columns: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Read data from raw parquet file, transform it, and optionally save to processed directory
 
@@ -557,17 +773,56 @@ class DataTransformer:
             raw_filepath: Path to raw parquet file
             save_processed: Whether to save transformed data to processed directory
             processed_format: Format for processed file ('parquet', 'csv', 'json')
+            columns: Raw columns to read (all when None)
 
         Returns:
-            Dict with transformation results and metadata
+            Dict with transformation results and metadata ('transformed_data' is a DataFrame)
         """
+        self.logger.info(f"Starting transformation from raw file: {raw_filepath}")
+
+        # Read data from raw file (kept columnar, no list of records in between)
         try:
-            self.logger.info(f"Starting transformation from raw file: {raw_filepath}")
+            raw_df = self._read_raw_frame(raw_filepath, columns)
+        except Exception as e:
+            self.logger.error(f"Error reading parquet file {raw_filepath}: {str(e)}")
+            raw_df = pd.DataFrame()
+        return self._transform_raw_records(raw_df, raw_filepath, save_processed, processed_format)
+
+    def transform_from_arrow(self, table: pa.Table, raw_filepath: Optional[str] = None, save_processed: bool = False,
+                             processed_format: str = 'parquet') -> Dict[str, Any]:
+        """
+        Transform raw data already held in memory as an Arrow table (e.g. the one
+        just written by the extractor), skipping the re-read of the raw parquet file
+
+        Args:
+            table: Raw data as an Arrow table
+            raw_filepath: Raw parquet file the table was saved to, if any (names the processed file)
+            save_processed: Whether to save transformed data to processed directory
+            processed_format: Format for processed file ('parquet', 'csv', 'json')
 
-            # Read data from raw file
-            raw_data = self.read_from_raw_parquet(raw_filepath)
+        Returns:
+            Dict with transformation results and metadata ('transformed_data' is a DataFrame)
+        """
+        self.logger.info(f"Starting transformation from in-memory table ({table.num_rows} rows)")
+        return self._transform_raw_records(table.to_pandas(), raw_filepath or 'accounts.parquet',
+                                           save_processed, processed_format)
+
+    def _transform_raw_records(self, raw_df: pd.DataFrame, raw_filepath: str, save_processed: bool,
+                               processed_format: str) -> Dict[str, Any]:
+        """
+        Transform raw records and optionally save them to processed directory
+
+        Args:
+            raw_df: Raw records as a DataFrame
+            raw_filepath: Path of the raw data source (names the processed file)
+            save_processed: Whether to save transformed data to processed directory
+            processed_format: Format for processed file ('parquet', 'csv', 'json')
 
-            if not raw_data:
+        Returns:
+            Dict with transformation results and metadata ('transformed_data' is a DataFrame)
+        """
+        try:
+            if raw_df.empty:
                 return {
                     'success': False,
                     'error': 'No data found in raw file',
@@ -576,13 +831,13 @@ class DataTransformer:
                     'transformed_data': None
                 }
 
-            # Transform the data
-            transformed_data = self.transform_data(raw_data)
+            # Transform the data (kept as a DataFrame for the rest of the pipeline)
+            transformed_data = self._as_plain_columns(self.transform_df(raw_df))
 
             result = {
                 'success': True,
                 'raw_filepath': raw_filepath,
-                'raw_records_count': len(raw_data),
+                'raw_records_count': len(raw_df),
                 'transformed_records_count': len(transformed_data),
                 'transformed_data': transformed_data,
                 'processed_filepath': None,
@@ -606,24 +861,26 @@ class DataTransformer:
 
                 # Save processed data
                 if processed_format.lower() == 'parquet':
-                    df_processed = pd.DataFrame(transformed_data)
-                    df_processed.to_parquet(processed_filepath, index=False)
+                    # zstd instead of the snappy default: smaller files at similar write speed;
+                    # dictionary encoding covers the low-cardinality category/label columns
+                    table = pa.Table.from_pandas(transformed_data, preserve_index=False)
+                    pq.write_table(table, processed_filepath, compression='zstd',
+                                   compression_level=self.PROCESSED_ZSTD_LEVEL, use_dictionary=True)
                 elif processed_format.lower() == 'csv':
-                    df_processed = pd.DataFrame(transformed_data)
-                    df_processed.to_csv(processed_filepath, index=False)
+                    transformed_data.to_csv(processed_filepath, index=False)
                 elif processed_format.lower() == 'json':
                     import json
                     with open(processed_filepath, 'w') as f:
-                        json.dump(transformed_data, f, indent=2, default=str)
+                        json.dump(transformed_data.to_dict('records'), f, indent=2, default=str)
 
                 result['processed_filepath'] = processed_filepath
                 self.logger.info(f"Processed data saved to: {processed_filepath}")
 
-            self.logger.info("Transformation from raw file completed successfully")
+            self.logger.info("Transformation of raw data completed successfully")
             return result
 
         except Exception as e:
-            error_message = f"Error in transform_from_raw_file: {str(e)}"
+            error_message = f"Error transforming raw data: {str(e)}"
             self.logger.error(error_message)
 
             return {
@@ -645,19 +902,20 @@ class DataTransformer:
             Path to the most recent parquet file
         """
         import os
-        import glob
 
         try:
-            # Pattern to match parquet files only
-            pattern = f"data/raw/{data_type}_*.parquet"
-            files = glob.glob(pattern)
-
-            if not files:
+            # Match data/raw/{data_type}_*.parquet and keep the most recently modified one in a
+            # single pass; scandir entries cache their stat and no list of matches is built
+            prefix = f"{data_type}_"
+            with os.scandir('data/raw') as entries:
+                latest = max((entry for entry in entries
+                              if entry.name.startswith(prefix) and entry.name.endswith('.parquet') and entry.is_file()),
+                             key=lambda entry: entry.stat().st_mtime, default=None)
+
+            if latest is None:
                 raise FileNotFoundError(f"No parquet files found for {data_type} in data/raw/")
 
-            # Sort by modification time (most recent first)
-            files.sort(key=os.path.getmtime, reverse=True)
-            latest_file = files[0]
+            latest_file = latest.path
 
             self.logger.info(f"Found latest {data_type} parquet file: {latest_file}")
             return latest_file
@@ -686,14 +944,17 @@ if __name__ == "__main__":
         if latest_parquet:
             print(f"📁 Found latest file: {latest_parquet}")
 
-            # Show raw data sample
-            raw_data = transformer.read_from_raw_parquet(latest_parquet)
-            print(f"📊 Raw data loaded: {len(raw_data)} records")
+            # Show raw data sample (only the source fields are read, not extraction_timestamp);
+            # the table stays columnar and only its first row is converted to Python objects
+            raw_table = pq.read_table(
+                latest_parquet, columns=['id', 'transactionDate', 'description', 'category', 'debit', 'credit']
+            )
+            print(f"📊 Raw data loaded: {raw_table.num_rows} records")
 
-            if raw_data:
+            if raw_table.num_rows:
                 print("\n📝 Sample raw record:")
-                for key, value in list(raw_data[0].items())[:6]:
-                    print(f"  {key}: {value}")
+                for key, values in raw_table.slice(0, 1).to_pydict().items():
+                    print(f"  {key}: {values[0]}")
 
             # Transform the data
             print(f"\n🔄 Applying transformations...")
@@ -710,24 +971,27 @@ if __name__ == "__main__":
                 print(f"💾 Processed file: {result['processed_filepath']}")
 
                 # Show sample transformed record
-                if result['transformed_data']:
+                if not result['transformed_data'].empty:
                     print(f"\n🔍 Sample transformed record (first 10 fields):")
-                    sample_record = result['transformed_data'][0]
-                    for key, value in list(sample_record.items())[:10]:
+                    # Only the 10 printed fields of the first row are read, not the whole record
+                    sample_record = result['transformed_data'].iloc[0, :10]
+                    for key, value in sample_record.items():
                         print(f"  {key}: {value}")
 
-                    print(f"\n📊 Total fields after transformation: {len(sample_record)}")
+                    transformed_fields = result['transformed_data'].columns
+                    print(f"\n📊 Total fields after transformation: {len(transformed_fields)}")
 
                     # Show new fields added
                     original_fields = ['category', 'credit', 'debit', 'description', 'id', 'transactionDate']
-                    new_fields = [field for field in sample_record.keys()
-                                if field not in [f.lower().replace('transactiondate', 'transaction_date')
-                                              for f in original_fields]]
+                    # Normalize the original names once, not again for every transformed field
+                    original_normalized = {f.lower().replace('transactiondate', 'transaction_date')
+                                           for f in original_fields}
+                    new_fields = [field for field in transformed_fields if field not in original_normalized]
                     print(f"🆕 New fields added: {len(new_fields)}")
                     print(f"   {', '.join(new_fields[:10])}{'...' if len(new_fields) > 10 else ''}")
 
                     # Quick data quality analysis
-                    df_analysis = pd.DataFrame(result['transformed_data'])
+                    df_analysis = result['transformed_data']
 
                     print(f"\n📊 Quick Analysis:")
                     if 'data_quality_score' in df_analysis.columns:
@@ -735,8 +999,9 @@ if __name__ == "__main__":
                         print(f"   Average quality score: {avg_quality:.2f}/100")
 
                     if 'transaction_category' in df_analysis.columns:
-                        top_category = df_analysis['transaction_category'].value_counts().index[0]
-                        top_count = df_analysis['transaction_category'].value_counts().iloc[0]
+                        # Only the top category is needed: take the argmax instead of sorting the counts
+                        category_counts = df_analysis['transaction_category'].value_counts(sort=False)
+                        top_category, top_count = category_counts.idxmax(), category_counts.max()
                         print(f"   Most common category: {top_category} ({top_count} transactions)")
 
                     if 'net_transaction_amount' in df_analysis.columns:
@@ -0,0 +1,80 @@
+"""
+Tests for the chunked Parquet export of querys/run_queries.py
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from contextlib import closing
+from unittest import mock
+
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'querys'))
+import run_queries  # noqa: E402
+
+
+class RunQueryParquetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.results_dir = os.path.join(self.tmp_dir.name, 'results')
+        os.makedirs(self.results_dir)
+
+        self.db_path = os.path.join(self.tmp_dir.name, 'test.sqlite')
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            conn.execute('CREATE TABLE t (id INTEGER, label TEXT, amount REAL)')
+            conn.executemany('INSERT INTO t VALUES (?, ?, ?)', [
+                (1, None, None), (2, None, None),
+                (3, 'a', 1.0), (4, 'b', None), (5, 'c', 2.5),
+            ])
+            conn.commit()
+
+        # Two rows per chunk: the first chunk only sees NULL labels and amounts
+        for name, value in (('CHUNK_SIZE', 2), ('RESULTS_DIR', self.results_dir)):
+            patcher = mock.patch.object(run_queries, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _write_query(self, name, query):
+        sql_file = os.path.join(self.tmp_dir.name, f'{name}.sql')
+        with open(sql_file, 'w', encoding='utf-8') as f:
+            f.write(query)
+        return sql_file
+
+    def test_null_columns_in_first_chunk_take_later_types(self):
+        sql_file = self._write_query('nulls_first', 'SELECT id, label, amount FROM t ORDER BY id')
+
+        preview, out_path = run_queries.run_query(sql_file, self.db_path)
+
+        self.assertEqual(len(preview), 2)
+        table = pq.read_table(out_path)
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(table.column('label').to_pylist(), [None, None, 'a', 'b', 'c'])
+        self.assertEqual(table.column('amount').to_pylist(), [None, None, 1.0, None, 2.5])
+        self.assertEqual(os.listdir(self.results_dir), ['nulls_first.parquet'])
+
+    def test_integer_column_widens_to_float_in_later_chunks(self):
+        # id is whole numbers in the first two chunks and has decimals in the last one
+        sql_file = self._write_query('widen', 'SELECT CASE WHEN id > 4 THEN id + 0.5 ELSE id END AS id FROM t ORDER BY id')
+
+        preview, out_path = run_queries.run_query(sql_file, self.db_path)
+
+        table = pq.read_table(out_path)
+        self.assertEqual(str(table.schema.field('id').type), 'double')
+        self.assertEqual(table.column('id').to_pylist(), [1.0, 2.0, 3.0, 4.0, 5.5])
+        self.assertEqual(os.listdir(self.results_dir), ['widen.parquet'])
+
+    def test_failed_query_leaves_no_partial_file(self):
+        sql_file = self._write_query('missing_table', 'SELECT * FROM missing_table')
+
+        with self.assertRaises(Exception):
+            run_queries.run_query(sql_file, self.db_path)
+
+        self.assertEqual(os.listdir(self.results_dir), [])
+
+if __name__ == '__main__':
+    unittest.main()